@@ -15,6 +15,8 @@ from app.core.config import get_settings
 from dotenv import load_dotenv
 from app.infrastructure.db.models.post_model import PostORM
 from app.infrastructure.db.models.user_model import UserORM
+from app.infrastructure.db.models.post_event_model import PostEventORM
+from app.infrastructure.db.models.revoked_token_model import RevokedTokenORM
 
 # Configuración de Alembic
 config = context.config
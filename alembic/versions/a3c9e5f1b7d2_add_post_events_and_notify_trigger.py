@@ -0,0 +1,62 @@
+"""Add post_events table and LISTEN/NOTIFY trigger on posts
+
+Revision ID: a3c9e5f1b7d2
+Revises: 61d51f0a3a4f
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e5f1b7d2'
+down_revision: Union[str, Sequence[str], None] = '61d51f0a3a4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_post_events_created_at', 'post_events', ['created_at'], unique=False)
+
+    # Cada cambio en posts se registra en post_events y se notifica por el canal 'post_changes'
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_post_change() RETURNS trigger AS $$
+        DECLARE
+            event_id BIGINT;
+            changed_id INTEGER := COALESCE(NEW.id, OLD.id);
+        BEGIN
+            INSERT INTO post_events (op, post_id, created_at)
+            VALUES (TG_OP, changed_id, now())
+            RETURNING id INTO event_id;
+            PERFORM pg_notify(
+                'post_changes',
+                json_build_object('id', event_id, 'op', TG_OP, 'post_id', changed_id)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON posts
+        FOR EACH ROW EXECUTE FUNCTION notify_post_change();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS posts_notify_change ON posts")
+    op.execute("DROP FUNCTION IF EXISTS notify_post_change()")
+    op.drop_index('idx_post_events_created_at', table_name='post_events')
+    op.drop_table('post_events')
@@ -0,0 +1,44 @@
+"""Add LISTEN/NOTIFY trigger on users for the availability index
+
+Revision ID: c4d7e2a9b613
+Revises: f27a8c3d5e14
+Create Date: 2026-10-19 17:41:09.532807
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2a9b613'
+down_revision: Union[str, Sequence[str], None] = 'f27a8c3d5e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Altas y cambios de username/email se notifican por 'user_availability' a todos los workers
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_user_availability() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'user_availability',
+                json_build_object('username', NEW.username, 'email', NEW.email)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_notify_availability
+        AFTER INSERT OR UPDATE OF username, email ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_user_availability();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_availability ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_availability()")
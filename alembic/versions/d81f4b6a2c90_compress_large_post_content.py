@@ -0,0 +1,89 @@
+"""Store large post content compressed (content_gz)
+
+Revision ID: d81f4b6a2c90
+Revises: a3c9e5f1b7d2
+Create Date: 2026-10-19 12:40:05.913264
+
+"""
+import gzip
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4b6a2c90'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e5f1b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Valores fijos en la migración (en la app: POST_CONTENT_COMPRESSION_*)
+THRESHOLD = 4096
+LEVEL = 6
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('content_gz', sa.LargeBinary(), nullable=True))
+    # Ya viene comprimido: que Postgres no intente comprimirlo otra vez al guardarlo en TOAST
+    op.execute("ALTER TABLE posts ALTER COLUMN content_gz SET STORAGE EXTERNAL")
+    op.alter_column('posts', 'content', existing_type=sa.Text(), nullable=True)
+
+    # Comprime por lotes el contenido existente que supera el umbral. Los lotes acotan la
+    # memoria, no la transacción: todo va en la transacción única de la migración.
+    # El contenido no cambia: se desactiva el trigger para no emitir post.updated falsos
+    op.execute("ALTER TABLE posts DISABLE TRIGGER posts_notify_change")
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, content FROM posts "
+                "WHERE id > :last_id AND octet_length(content) > :threshold "
+                "ORDER BY id LIMIT :batch"
+            ),
+            {"last_id": last_id, "threshold": THRESHOLD, "batch": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE posts SET content = NULL, content_gz = :content_gz WHERE id = :id"),
+            [
+                {"id": row.id, "content_gz": gzip.compress(row.content.encode("utf-8"), compresslevel=LEVEL, mtime=0)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+    op.execute("ALTER TABLE posts ENABLE TRIGGER posts_notify_change")
+
+    op.create_check_constraint('ck_posts_content_present', 'posts', 'content IS NOT NULL OR content_gz IS NOT NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE posts DISABLE TRIGGER posts_notify_change")
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, content_gz FROM posts "
+                "WHERE id > :last_id AND content_gz IS NOT NULL "
+                "ORDER BY id LIMIT :batch"
+            ),
+            {"last_id": last_id, "batch": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE posts SET content = :content, content_gz = NULL WHERE id = :id"),
+            [{"id": row.id, "content": gzip.decompress(row.content_gz).decode("utf-8")} for row in rows],
+        )
+        last_id = rows[-1].id
+    op.execute("ALTER TABLE posts ENABLE TRIGGER posts_notify_change")
+
+    op.drop_constraint('ck_posts_content_present', 'posts', type_='check')
+    op.alter_column('posts', 'content', existing_type=sa.Text(), nullable=False)
+    op.drop_column('posts', 'content_gz')
@@ -0,0 +1,37 @@
+"""Replace idx_posts_created_at with an index in list_recent order
+
+Revision ID: e6b2f9c4a8d7
+Revises: c4d7e2a9b613
+Create Date: 2026-10-19 19:20:47.381052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2f9c4a8d7'
+down_revision: Union[str, Sequence[str], None] = 'c4d7e2a9b613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # list_recent ordena por created_at DESC NULLS LAST, id DESC. El índice ascendente
+    # recorrido hacia atrás da NULLS FIRST y obliga a ordenar toda la tabla
+    op.create_index(
+        'idx_posts_created_at_desc',
+        'posts',
+        [sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.drop_index('idx_posts_created_at', table_name='posts')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_posts_created_at', 'posts', ['created_at'], unique=False)
+    op.drop_index('idx_posts_created_at_desc', table_name='posts')
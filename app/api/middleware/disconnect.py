@@ -0,0 +1,95 @@
+# app/api/middleware/disconnect.py
+import asyncio
+import logging
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Clave del scope con el estado de cancelación de la request (lo crea DisconnectMiddleware)
+DISCONNECT_STATE_KEY = "app.disconnect_state"
+
+
+class _DisconnectState:
+    """
+    Vigila `http.disconnect` mientras el handler está en curso y, si llega antes de
+    empezar la respuesta, cancela la tarea de la request. Una vez enviada la cabecera
+    de respuesta ya no se cancela nada: uvicorn devuelve `http.disconnect` al terminar
+    cualquier respuesta, y el streaming, las background tasks y el cierre de las
+    dependencias deben completarse.
+    """
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.response_started = False
+        self.cancelled = False
+        self._watcher: Optional[asyncio.Task] = None
+
+    def watch(self, receive: Receive) -> None:
+        if self._watcher is None and not self.response_started:
+            self._watcher = asyncio.create_task(self._watch(receive), name="disconnect-watcher")
+
+    def stop(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+
+    async def _watch(self, receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                if not self.response_started:
+                    self.cancelled = True
+                    self.task.cancel()
+                return
+
+
+def cancel_on_disconnect(scope: Scope, receive: Receive) -> None:
+    """
+    Pide cancelar la request si el cliente se desconecta antes de la respuesta. Llamar
+    solo cuando el body ya se leyó (lo siguiente que llega por `receive` es la desconexión).
+    Sin DisconnectMiddleware no hace nada.
+    """
+    state = scope.get(DISCONNECT_STATE_KEY)
+    if state is not None:
+        state.watch(receive)
+
+
+class DisconnectMiddleware:
+    """
+    Cancela las requests cuyo cliente se desconecta antes de recibir la respuesta (ver
+    `cancel_on_disconnect`) y descarta en silencio esa cancelación, que si no llegaría
+    al servidor como "Exception in ASGI application". Cualquier otra cancelación se
+    propaga tal cual.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = _DisconnectState(asyncio.current_task())
+        scope[DISCONNECT_STATE_KEY] = state
+
+        async def send_stopping_watch(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state.response_started = True
+                state.stop()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_stopping_watch)
+        except asyncio.CancelledError:
+            if not state.cancelled:
+                raise
+            # La cancelación ya está atendida: que no cuente para quien espere esta tarea
+            asyncio.current_task().uncancel()
+            metrics.inc("requests_cancelled_total", reason="client_disconnect")
+            logger.info(f"Request cancelada: el cliente se desconectó ({scope['method']} {scope['path']})")
+        finally:
+            state.stop()
@@ -0,0 +1,158 @@
+# app/api/middleware/negotiation.py
+import gzip
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.responses import (
+    JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, json_to_msgpack, msgpack, negotiate_media_type, parse_quality_header,
+)
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+# Tipos que no vale la pena comprimir (ya comprimidos o de streaming)
+SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Elige 'br' o 'gzip' según las calidades de Accept-Encoding (br gana en empate)."""
+    if not accept_encoding:
+        return None
+    qualities = parse_quality_header(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = qualities.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class ContentNegotiationMiddleware:
+    """
+    Middleware ASGI que negocia la representación de la respuesta:
+    - Accept: las respuestas JSON se transcodifican a MessagePack si el cliente lo pide.
+    - Accept-Encoding: brotli o gzip a partir de `minimum_size` bytes.
+    Los cuerpos de `threadpool_min_bytes` bytes o más se procesan fuera del event loop.
+    Las respuestas en streaming o ya codificadas se dejan pasar sin tocar.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        threadpool_min_bytes: int = 256 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.threadpool_min_bytes = threadpool_min_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        media_type = negotiate_media_type(headers.get("accept", ""))
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        if encoding is None and msgpack is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _NegotiationResponder(self, media_type, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    async def process(self, body: bytes, func, *args) -> bytes:
+        """Ejecuta `func(body, *args)`, en el threadpool si el cuerpo es grande."""
+        if len(body) >= self.threadpool_min_bytes:
+            return await run_in_threadpool(func, body, *args)
+        return func(body, *args)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        start = time.thread_time()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        cpu_seconds = time.thread_time() - start
+        metrics.inc("http_compression_input_bytes_total", len(body), encoding=encoding)
+        metrics.inc("http_compression_output_bytes_total", len(compressed), encoding=encoding)
+        metrics.inc("http_compression_cpu_seconds_total", cpu_seconds, encoding=encoding)
+        return compressed
+
+
+class _NegotiationResponder:
+    """Intercepta `send` para transcodificar y/o comprimir respuestas completas (un solo mensaje de body)."""
+
+    def __init__(
+        self, middleware: ContentNegotiationMiddleware, media_type: str, encoding: Optional[str], send: Send
+    ):
+        self.middleware = middleware
+        self.media_type = media_type
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.transcode = False
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or content_type.startswith(SKIP_CONTENT_TYPES):
+                self.passthrough = True
+                await self._send(message)
+                return
+            is_json = content_type.startswith(JSON_MEDIA_TYPE)
+            if is_json and msgpack is not None:
+                headers.add_vary_header("Accept")
+            self.transcode = is_json and self.media_type == MSGPACK_MEDIA_TYPE
+            if not self.transcode and self.encoding is None:
+                self.passthrough = True
+                await self._send(message)
+                return
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        start_message, self.start_message = self.start_message, None
+        body = message.get("body", b"")
+        self.passthrough = True
+
+        # Streaming (más de un chunk): se envía tal cual
+        if message.get("more_body", False):
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        # Sin cuerpo (HEAD, 204/304) se conservan los headers tal cual, Content-Length incluido
+        headers = MutableHeaders(raw=start_message["headers"])
+        if self.transcode and body:
+            body = await self.middleware.process(body, json_to_msgpack)
+            headers["Content-Type"] = MSGPACK_MEDIA_TYPE
+            headers["Content-Length"] = str(len(body))
+        if self.encoding is not None and len(body) >= self.middleware.minimum_size:
+            body = await self.middleware.process(body, self.middleware.compress, self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+        await self._send(start_message)
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
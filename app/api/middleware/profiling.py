@@ -0,0 +1,72 @@
+# app/api/middleware/profiling.py
+import hmac
+import os
+import time
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import RequestTimings, SamplingProfiler, request_timings_var
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class ProfilingMiddleware:
+    """
+    Perfila bajo demanda una sola request: solo si trae `X-Profile: <PROFILING_SECRET>`.
+    - Guarda las pilas muestreadas en `<output_dir>/<id>.folded` y devuelve el id en `X-Profile-Id`.
+    - Devuelve el reparto del tiempo en `Server-Timing` (db, serialize, handler, total).
+    """
+
+    def __init__(self, app: ASGIApp, secret: str, output_dir: str = "profiles", interval_ms: float = 1.0):
+        self.app = app
+        self.secret = secret.encode("utf-8")
+        self.output_dir = output_dir
+        self.interval = interval_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_authorized(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # El nombre del fichero nunca sale de la request (X-Request-ID lo controla el cliente)
+        profile_id = uuid.uuid4().hex
+        timings = RequestTimings()
+        profiler = SamplingProfiler(self.interval)
+        started = time.perf_counter()
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - started
+                handler = max(total - timings.db_seconds - timings.serialization_seconds, 0.0)
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append(
+                    "Server-Timing",
+                    f"db;dur={timings.db_seconds * 1000:.2f}, "
+                    f"serialize;dur={timings.serialization_seconds * 1000:.2f}, "
+                    f"handler;dur={handler * 1000:.2f}, "
+                    f"total;dur={total * 1000:.2f}",
+                )
+                headers[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        token = request_timings_var.set(timings)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            profiler.stop()
+            request_timings_var.reset(token)
+            await run_in_threadpool(self._write_profile, profile_id, profiler.folded())
+
+    def _is_authorized(self, scope: Scope) -> bool:
+        value = Headers(scope=scope).get(PROFILE_HEADER)
+        return bool(value) and hmac.compare_digest(value.encode("utf-8"), self.secret)
+
+    def _write_profile(self, profile_id: str, folded: str) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, f"{profile_id}.folded"), "w", encoding="utf-8") as f:
+            f.write(folded)
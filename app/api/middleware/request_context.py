@@ -0,0 +1,42 @@
+# app/api/middleware/request_context.py
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_context import request_id_var, request_scope_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+MAX_REQUEST_ID_LENGTH = 128
+
+
+class RequestContextMiddleware:
+    """
+    Asigna un request ID (el de `X-Request-ID` si viene, o uno nuevo) y lo deja
+    en contexto para los logs; también lo devuelve en la respuesta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"])[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        id_token = request_id_var.set(request_id)
+        scope_token = request_scope_var.set(scope)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_scope_var.reset(scope_token)
+            request_id_var.reset(id_token)
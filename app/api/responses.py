@@ -0,0 +1,68 @@
+# app/api/responses.py
+import json
+import time
+from typing import Optional
+
+from app.core.metrics import metrics
+from app.core.profiling import record_serialization
+
+try:
+    import msgpack
+except ImportError:  # msgpack es opcional: sin él solo se sirve JSON
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+def parse_quality_header(value: str) -> dict:
+    """Convierte un header tipo Accept/Accept-Encoding en {token: q}."""
+    qualities = {}
+    for item in value.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        token = parts[0].lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        qualities[token] = max(q, qualities.get(token, 0.0))
+    return qualities
+
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    Devuelve MessagePack solo si el cliente lo pide explícitamente
+    con una calidad igual o mayor que la de JSON; en otro caso JSON.
+    """
+    if msgpack is None or not accept:
+        return JSON_MEDIA_TYPE
+    qualities = parse_quality_header(accept)
+    q_msgpack = max(qualities.get(m, 0.0) for m in MSGPACK_MEDIA_TYPES)
+    if q_msgpack <= 0:
+        return JSON_MEDIA_TYPE
+    q_json = qualities.get(JSON_MEDIA_TYPE, qualities.get("application/*", qualities.get("*/*", 0.0)))
+    return MSGPACK_MEDIA_TYPE if q_msgpack >= q_json else JSON_MEDIA_TYPE
+
+
+def json_to_msgpack(body: bytes) -> bytes:
+    """
+    Transcodifica un cuerpo JSON ya renderizado a MessagePack. Solo lo pagan los
+    clientes que negocian MessagePack: el resto usa el render JSON nativo de FastAPI.
+    """
+    start = time.thread_time()
+    packed = msgpack.packb(json.loads(body), use_bin_type=True)
+    elapsed = time.thread_time() - start
+    _record_render(MSGPACK_MEDIA_TYPE, len(packed), elapsed)
+    record_serialization(elapsed)
+    return packed
+
+
+def _record_render(media_type: Optional[str], size: int, cpu_seconds: float) -> None:
+    metrics.inc("http_response_render_bytes_total", size, media_type=media_type)
+    metrics.inc("http_response_render_cpu_seconds_total", cpu_seconds, media_type=media_type)
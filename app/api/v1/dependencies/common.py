@@ -1,23 +1,53 @@
 # app/api/v1/dependencies/common.py
+import time
 from typing import AsyncGenerator
-from fastapi import Depends
-from app.infrastructure.db.db_session import AsyncSessionLocal, AsyncSession
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from app.api.middleware.disconnect import cancel_on_disconnect
+from app.infrastructure.db.db_session import AsyncSessionLocal, AsyncSession, DEADLINE_KEY
 from app.infrastructure.db.repositories.user_repository_impl import UserRepositoryImpl
 from app.infrastructure.db.repositories.post_repository_impl import PostRepositoryImpl
 from app.use_cases.user_service import UserService
 from app.use_cases.post_service import PostService
+from app.use_cases.auth_service import AuthService
+from app.core.exceptions import AuthenticationError
+from app.core.config import get_settings
+from app.schemas.auth_schema import AuthenticatedUser
+
+settings = get_settings()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"  # milisegundos
 
 # Generador de sesión DB (esto sí puede ser async generator)
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sesión con deadline: cada transacción aplica el presupuesto restante como
+    `statement_timeout`, y si el cliente se desconecta antes de la respuesta se
+    cancela la request (asyncpg cancela la consulta en curso y la conexión vuelve al pool).
+    """
     async with AsyncSessionLocal() as session:
+        session.info[DEADLINE_KEY] = time.monotonic() + _request_timeout_ms(request) / 1000
+        # El body ya se leyó antes de resolver dependencias: lo siguiente que llega es la desconexión
+        cancel_on_disconnect(request.scope, request.receive)
         yield session
 
+def _request_timeout_ms(request: Request) -> int:
+    """Deadline de la ruta (o el global), reemplazable por header hasta REQUEST_TIMEOUT_MAX_MS."""
+    route = request.scope.get("route")
+    timeout_ms = settings.ROUTE_TIMEOUTS_MS.get(getattr(route, "path", None), settings.REQUEST_TIMEOUT_MS)
+    header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+    if header and header.isdigit():
+        timeout_ms = min(max(int(header), 1), settings.REQUEST_TIMEOUT_MAX_MS)
+    return timeout_ms
+
 # Repositorios
 def get_user_repository(session: AsyncSession = Depends(get_db_session)) -> UserRepositoryImpl:
-    return UserRepositoryImpl(session)
+    return UserRepositoryImpl(session, core_reads=settings.USE_CORE_READ_PATH)
 
 def get_post_repository(session: AsyncSession = Depends(get_db_session)) -> PostRepositoryImpl:
-    return PostRepositoryImpl(session)
+    return PostRepositoryImpl(session, core_reads=settings.USE_CORE_READ_PATH)
 
 # Servicios
 def get_user_service(user_repo: UserRepositoryImpl = Depends(get_user_repository)) -> UserService:
@@ -25,3 +55,20 @@ def get_user_service(user_repo: UserRepositoryImpl = Depends(get_user_repository
 
 def get_post_service(post_repo: PostRepositoryImpl = Depends(get_post_repository)) -> PostService:
     return PostService(post_repo)
+
+def get_auth_service(user_repo: UserRepositoryImpl = Depends(get_user_repository)) -> AuthService:
+    return AuthService(user_repo)
+
+# Autenticación
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> AuthenticatedUser:
+    try:
+        return await auth_service.resolve_token(token)
+    except AuthenticationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,40 @@
+# app/api/v1/endpoints/auth_router.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from app.api.v1.dependencies.common import get_auth_service, get_current_user, oauth2_scheme
+from app.core.exceptions import AuthenticationError
+from app.schemas.auth_schema import Token, AuthenticatedUser
+
+router = APIRouter()
+
+# ==========================================================
+# 🔹 Login (emite token de acceso)
+# ==========================================================
+@router.post("/login", response_model=Token)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), service = Depends(get_auth_service)):
+    try:
+        return await service.authenticate(form_data.username, form_data.password)
+    except AuthenticationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+# ==========================================================
+# 🔹 Logout (revoca el token actual)
+# ==========================================================
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    service = Depends(get_auth_service),
+):
+    await service.logout(token)
+
+# ==========================================================
+# 🔹 Usuario autenticado
+# ==========================================================
+@router.get("/me", response_model=AuthenticatedUser)
+async def read_current_user(current_user: AuthenticatedUser = Depends(get_current_user)):
+    return current_user
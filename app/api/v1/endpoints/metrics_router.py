@@ -0,0 +1,13 @@
+# app/api/v1/endpoints/metrics_router.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+# ==========================================================
+# 🔹 Métricas en formato Prometheus
+# ==========================================================
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return metrics.render_prometheus()
@@ -1,10 +1,23 @@
 # app/api/v1/endpoints/post_router.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, status
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional
 from uuid import UUID
 from app.api.v1.dependencies.common import get_post_service as PostService
 from app.api.v1.dependencies.common import get_post_service
-from app.schemas.post_schema import PostCreate, PostUpdate, PostResponse
+from app.schemas.post_schema import PostCreate, PostUpdate, PostResponse, PostListResponse
+from app.api.responses import parse_quality_header
+from app.infrastructure.db.post_content import iter_decompressed
+from app.infrastructure.services.post_change_feed import post_change_feed
+from app.infrastructure.services.recent_posts_snapshot import recent_posts_snapshot
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Nombre del evento SSE según la operación registrada por el trigger
+SSE_EVENT_NAMES = {"INSERT": "post.created", "UPDATE": "post.updated", "DELETE": "post.deleted"}
 
 router = APIRouter()
 
@@ -19,6 +32,71 @@ async def create_post(post_data: PostCreate, service = Depends(get_post_service)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+# ==========================================================
+# 🔹 Posts recientes (snapshot en memoria, sin BD). Declarado antes de /{post_id}
+# ==========================================================
+@router.get("/recent", response_class=Response)
+async def get_recent_posts(request: Request):
+    snapshot = recent_posts_snapshot.current
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Snapshot aún no disponible")
+    headers = {
+        "ETag": snapshot.etag,
+        "Age": str(int(snapshot.age)),
+        "Cache-Control": f"max-age={settings.RECENT_POSTS_REFRESH_SECONDS}",
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if parse_quality_header(request.headers.get("accept-encoding", "")).get("gzip", 0) > 0:
+        return Response(
+            snapshot.body_gz, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"}
+        )
+    return Response(snapshot.body, media_type="application/json", headers=headers)
+
+# ==========================================================
+# 🔹 Stream de cambios (SSE). Declarado antes de /{post_id}
+# ==========================================================
+@router.get("/stream")
+async def stream_post_changes(
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    # El header lo envía EventSource al reconectar; el query param permite reanudar a mano
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+    subscriber, replay = await post_change_feed.subscribe(resume_from)
+    return StreamingResponse(
+        _sse_events(subscriber, replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _sse_events(subscriber, replay):
+    # No usa sesión de BD: cada cliente solo ocupa su cola y esta corrutina
+    try:
+        sent = set()
+        async for event in replay:
+            sent.add(event["id"])
+            yield _format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=settings.POST_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is None:  # Descartado por lento
+                return
+            if event["id"] not in sent:
+                yield _format_sse(event)
+    finally:
+        post_change_feed.unsubscribe(subscriber)
+
+def _format_sse(event: dict) -> str:
+    data = json.dumps({"op": event["op"], "post_id": event["post_id"]})
+    return f"id: {event['id']}\nevent: {SSE_EVENT_NAMES.get(event['op'], 'post.changed')}\ndata: {data}\n\n"
+
 # ==========================================================
 # 🔹 Obtener post por ID
 # ==========================================================
@@ -29,10 +107,31 @@ async def get_post_by_id(post_id: int, service = Depends(get_post_service)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post no encontrado")
     return post
 
+# ==========================================================
+# 🔹 Contenido de un post (texto plano)
+# ==========================================================
+@router.get("/{post_id}/content", response_class=Response)
+async def get_post_content(post_id: int, request: Request, service = Depends(get_post_service)):
+    stored = await service.get_post_content(post_id)
+    if not stored:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post no encontrado")
+    content, content_gz = stored
+    media_type = "text/plain; charset=utf-8"
+    if content_gz is None:
+        return Response(content, media_type=media_type)
+    # Si el cliente acepta gzip se envían los bytes guardados, sin descomprimir
+    if parse_quality_header(request.headers.get("accept-encoding", "")).get("gzip", 0) > 0:
+        return Response(
+            content_gz,
+            media_type=media_type,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return StreamingResponse(iter_decompressed(content_gz), media_type=media_type)
+
 # ==========================================================
 # 🔹 Listar todos los posts
 # ==========================================================
-@router.get("/", response_model=List[PostResponse])
+@router.get("/", response_model=List[PostListResponse])
 async def list_all_posts(service = Depends(get_post_service)):
     posts = await service.list_posts()  # <-- usa el nombre correcto
     return posts
@@ -1,10 +1,13 @@
 # app/api/v1/endpoints/user_router.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from typing import List, Optional
+from pydantic import EmailStr
 from uuid import UUID
 from app.use_cases.user_service import UserService
-from app.api.v1.dependencies.common import get_user_service
-from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
+from app.api.v1.dependencies.common import get_current_user, get_user_service
+from app.schemas.auth_schema import AuthenticatedUser
+from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse, AvailabilityResponse
+from app.core.exceptions import DuplicateUserError
 
 router = APIRouter()
 
@@ -19,9 +22,24 @@ async def create_user(
     try:
         user = await service.create_user(user_data)
         return user
+    except DuplicateUserError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# ==========================================================
+# 🔹 Disponibilidad de username / email. Declarado antes de /{user_id}
+# ==========================================================
+@router.get("/availability", response_model=AvailabilityResponse)
+async def check_availability(
+    username: Optional[str] = None,
+    email: Optional[EmailStr] = None,
+    service = Depends(get_user_service),
+):
+    if username is None and email is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Indica username o email")
+    return await service.check_availability(username=username, email=email)
+
 # ==========================================================
 # 🔹 Obtener usuario por ID
 # ==========================================================
@@ -44,8 +62,17 @@ async def list_all_users(service = Depends(get_user_service)):
 # 🔹 Actualizar usuario
 # ==========================================================
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user(user_id: int, user_data: UserUpdate, service = Depends(get_user_service)):
-    user = await service.update_user(user_id, user_data)
+async def update_user(
+    user_id: int,
+    user_data: UserUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    service = Depends(get_user_service),
+):
+    _ensure_owner(current_user, user_id)
+    try:
+        user = await service.update_user(user_id, user_data)
+    except DuplicateUserError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
     return user
@@ -54,8 +81,17 @@ async def update_user(user_id: int, user_data: UserUpdate, service = Depends(get
 # 🔹 Eliminar usuario
 # ==========================================================
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: int, service = Depends(get_user_service)):
+async def delete_user(
+    user_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    service = Depends(get_user_service),
+):
+    _ensure_owner(current_user, user_id)
     deleted = await service.delete_user(user_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
 
+def _ensure_owner(current_user: AuthenticatedUser, user_id: int) -> None:
+    # Cambiar o borrar una cuenta invalida sus tokens en todos los workers: solo su dueño
+    if current_user.id != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo puedes modificar tu propia cuenta")
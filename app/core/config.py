@@ -1,6 +1,7 @@
 # app/core/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Dict
 
 class Settings(BaseSettings):
     # Configuración general de la app
@@ -8,6 +9,38 @@ class Settings(BaseSettings):
     APP_ENV: str = "development"  # Puede ser 'development', 'production', 'testing'
     DEBUG: bool = True
 
+    # Contenido de posts
+    POST_CONTENT_COMPRESSION_THRESHOLD: int = 4096  # bytes; por encima se guarda en gzip
+    POST_CONTENT_COMPRESSION_LEVEL: int = 6
+
+    # Snapshot en memoria de posts recientes
+    RECENT_POSTS_SNAPSHOT_SIZE: int = 50
+    RECENT_POSTS_REFRESH_SECONDS: int = 5
+
+    # Filtro de disponibilidad de username/email (por worker)
+    AVAILABILITY_FILTER_CAPACITY: int = 1_000_000
+    AVAILABILITY_FILTER_ERROR_RATE: float = 0.01
+    AVAILABILITY_REFRESH_SECONDS: int = 300      # reconstrucción periódica desde la BD
+
+    # Stream de cambios de posts (SSE)
+    POST_STREAM_QUEUE_SIZE: int = 100            # eventos pendientes por cliente antes de descartarlo
+    POST_STREAM_BUFFER_SIZE: int = 1000          # eventos recientes en memoria para reanudar
+    POST_STREAM_HEARTBEAT_SECONDS: int = 15
+    POST_EVENTS_RETENTION_HOURS: int = 24        # antigüedad máxima en post_events
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True                        # una línea JSON por registro
+    LOG_INFO_SAMPLE_RATE: float = 1.0            # fracción de logs INFO por request que se conservan
+    LOG_SAMPLE_RATES: Dict[str, float] = {}      # por ruta, p.ej. {"/posts/": 0.1}
+    SQL_ECHO: bool = False                       # registra cada sentencia SQL (solo si se activa)
+
+    # Profiling bajo demanda (header X-Profile: <PROFILING_SECRET>)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SECRET: str = ""
+    PROFILING_OUTPUT_DIR: str = "profiles"
+    PROFILING_INTERVAL_MS: float = 1.0
+
     # Configuración de base de datos
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -15,12 +48,28 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     DATABASE_URL: str  # Puedes construirla dinámicamente si quieres
+    USE_CORE_READ_PATH: bool = False  # Lecturas con Core (filas -> respuesta) en vez del ORM
+
+    # Deadlines por request (se aplican como statement_timeout)
+    REQUEST_TIMEOUT_MS: int = 10000
+    REQUEST_TIMEOUT_MAX_MS: int = 30000          # tope para el header X-Request-Timeout
+    ROUTE_TIMEOUTS_MS: Dict[str, int] = {}       # por ruta, p.ej. {"/posts/": 2000}
 
     # Configuración de JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Caché de tokens verificados (por worker)
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60  # tope de vida de una entrada, aunque el token dure más
+
+    # Compresión y codificación de respuestas
+    COMPRESSION_MINIMUM_SIZE: int = 1024         # bytes; por debajo no se comprime
+    COMPRESSION_GZIP_LEVEL: int = 6              # 1 (rápido) - 9 (máxima compresión)
+    COMPRESSION_BROTLI_QUALITY: int = 4          # 0 (rápido) - 11 (máxima compresión)
+    COMPRESSION_THREADPOOL_MIN_BYTES: int = 262144  # bytes; desde aquí se comprime fuera del event loop
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,9 @@
+# app/core/exceptions.py
+
+
+class AuthenticationError(Exception):
+    """Credenciales o token inválidos, expirados o revocados."""
+
+
+class DuplicateUserError(ValueError):
+    """El username o el email ya están registrados."""
@@ -1,11 +1,105 @@
 # app/core/logging_config.py
+import atexit
+import json
 import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
 
-# Nivel de logging
-LOG_LEVEL = logging.INFO
+from app.core.config import get_settings
+from app.core.request_context import get_request_id, get_route
 
-# Formato
-LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Formato (modo texto, LOG_JSON=False)
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
 
-def setup_logging():
-    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+# Loggers de uvicorn: los configura con handlers propios (síncronos) antes de importar la app
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro, con request ID y ruta."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "route": getattr(record, "route", None),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RouteSamplingFilter(logging.Filter):
+    """
+    Muestrea los logs INFO (y menores) emitidos dentro de una request según su ruta.
+    WARNING o superior, y los logs fuera de request, nunca se descartan.
+    """
+
+    def __init__(self, default_rate: float, route_rates: Dict[str, float]):
+        super().__init__()
+        self.default_rate = default_rate
+        self.route_rates = route_rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        route = get_route()
+        if route is None:
+            return True
+        rate = self.route_rates.get(route, self.default_rate)
+        return rate >= 1.0 or random.random() < rate
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Encola el registro sin formatearlo: el formateo y la escritura ocurren en el
+    hilo del QueueListener. Solo se captura aquí el contexto de la request.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = get_request_id() or "-"
+        record.route = get_route()
+        return record
+
+
+def setup_logging() -> QueueListener:
+    """Configura el logging raíz: cola en memoria + hilo de escritura a stderr."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    settings = get_settings()
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if settings.LOG_JSON else logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(RouteSamplingFilter(settings.LOG_INFO_SAMPLE_RATE, settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    # Los logs de uvicorn (incluido el access log) van por la misma cola y el mismo muestreo
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    # El SQL solo se registra si se pide explícitamente (y pasa por la misma cola)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.SQL_ECHO else logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
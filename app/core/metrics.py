@@ -0,0 +1,55 @@
+# app/core/metrics.py
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+# Clave de una serie: (nombre, etiquetas ordenadas)
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas en memoria (por worker).
+    Contadores acumulativos y gauges calculados al leer; se exponen en formato Prometheus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[SeriesKey, float] = defaultdict(float)
+        self._gauges: Dict[SeriesKey, Callable[[], float]] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> SeriesKey:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def gauge(self, name: str, fn: Callable[[], float], **labels) -> None:
+        """Registra un gauge cuyo valor se calcula con `fn` en cada lectura."""
+        with self._lock:
+            self._gauges[self._key(name, labels)] = fn
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        lines = []
+        for (name, labels), value in sorted(counters.items()):
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        for (name, labels), fn in sorted(gauges.items(), key=lambda item: item[0]):
+            lines.append(f"{name}{_format_labels(labels)} {fn()}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+# Registro global de la aplicación
+metrics = MetricsRegistry()
@@ -0,0 +1,81 @@
+# app/core/profiling.py
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class RequestTimings:
+    """Tiempos acumulados de una request perfilada (segundos)."""
+    db_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+
+
+# Solo tiene valor durante una request perfilada: fuera de ella el coste es un ContextVar.get()
+request_timings_var: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_serialization(seconds: float) -> None:
+    timings = request_timings_var.get()
+    if timings is not None:
+        timings.serialization_seconds += seconds
+
+
+def install_db_timing(engine: AsyncEngine) -> None:
+    """Mide el tiempo de espera de cada sentencia SQL y lo suma a la request perfilada."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if request_timings_var.get() is not None:
+            context._profiling_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_profiling_start", None)
+        timings = request_timings_var.get()
+        if start is not None and timings is not None:
+            timings.db_seconds += time.perf_counter() - start
+
+
+class SamplingProfiler:
+    """
+    Profiler por muestreo: un hilo toma cada `interval` segundos la pila del hilo objetivo
+    (el del event loop) y acumula las pilas en formato "folded" (compatible con flamegraph.pl
+    y speedscope). Como el event loop es compartido, las muestras pueden incluir trabajo de
+    otras requests concurrentes.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
@@ -0,0 +1,23 @@
+# app/core/request_context.py
+from contextvars import ContextVar
+from typing import Optional
+
+# Contexto de la request en curso (lo fija RequestContextMiddleware)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+request_scope_var: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+def get_route() -> Optional[str]:
+    """
+    Plantilla de la ruta en curso (p.ej. '/posts/{post_id}') o, si aún no se ha
+    resuelto el enrutado, el path literal. None fuera de una request.
+    """
+    scope = request_scope_var.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path")
@@ -1,6 +1,16 @@
 # app/core/security.py
+import hashlib
+import uuid
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.config import get_settings
+from app.core.exceptions import AuthenticationError
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
@@ -8,3 +18,40 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+@lru_cache(maxsize=1)
+def dummy_password_hash() -> str:
+    """Hash de referencia para verificar contra él cuando el usuario no existe (mismo coste)."""
+    return hash_password(uuid.uuid4().hex)
+
+# ==========================================================
+# 🔹 JWT
+# ==========================================================
+def create_access_token(user_id: int, token_version: int = 0, expires_minutes: Optional[int] = None) -> str:
+    """`ver` es la users.token_version vigente al emitirlo: al incrementarla se invalidan todos."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {
+        "sub": str(user_id),
+        "ver": token_version,
+        "iat": now,
+        "exp": expire,
+        "jti": uuid.uuid4().hex,
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def decode_access_token(token: str) -> dict:
+    """Verifica firma y expiración; lanza AuthenticationError si el token no es válido."""
+    settings = get_settings()
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        raise AuthenticationError("Token inválido o expirado") from e
+    if "sub" not in payload or "exp" not in payload:
+        raise AuthenticationError("Token incompleto")
+    return payload
+
+def token_hash(token: str) -> str:
+    """Hash del token para usarlo como clave de caché sin guardar el token en claro."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
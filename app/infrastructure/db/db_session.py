@@ -1,14 +1,16 @@
 # app/infrastructure/db/db_session.py
+import time
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from app.core.config import get_settings
 
 settings = get_settings()
 
-# Engine Async
+# Engine Async (el log de SQL se controla con SQL_ECHO en logging_config)
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=False,
     pool_size=10,
     max_overflow=20,
     pool_timeout=30,
@@ -28,6 +30,18 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Clave en session.info con el deadline (time.monotonic()) de la request
+DEADLINE_KEY = "deadline"
+
+@event.listens_for(Session, "after_begin")
+def apply_statement_timeout(session, transaction, connection):
+    """Limita cada transacción al tiempo que le queda a la request (SET LOCAL)."""
+    deadline = session.info.get(DEADLINE_KEY)
+    if deadline is None:
+        return
+    remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
 async def dispose_db():
     """Cierra el engine de SQLAlchemy al apagar la aplicación"""
     await engine.dispose()
@@ -4,5 +4,7 @@
 
 from .user_model import UserORM
 from .post_model import PostORM
+from .post_event_model import PostEventORM
+from .revoked_token_model import RevokedTokenORM
 
-__all__ = ["UserORM", "PostORM"]
+__all__ = ["UserORM", "PostORM", "PostEventORM", "RevokedTokenORM"]
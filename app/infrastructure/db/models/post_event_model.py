@@ -0,0 +1,30 @@
+# app/infrastructure/db/models/post_event_model.py
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Integer, String, DateTime, Index
+from app.infrastructure.db.db_session import Base
+from datetime import datetime, timezone
+
+class PostEventORM(Base):
+    """
+    Registro de cambios en `posts` (lo escribe el trigger `posts_notify_change`).
+    Sirve para reanudar el stream desde el último `id` recibido por el cliente.
+    """
+    __tablename__ = "post_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # INSERT / UPDATE / DELETE
+    post_id: Mapped[int] = mapped_column(Integer, nullable=False)  # Sin FK: el post puede haberse borrado
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    # Índices
+    __table_args__ = (
+        Index('idx_post_events_created_at', 'created_at'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PostEventORM(id={self.id}, op='{self.op}', post_id={self.post_id})>"
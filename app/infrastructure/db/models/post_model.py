@@ -1,15 +1,19 @@
 # app/infrastructure/db/models/post_model.py
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, Text, ForeignKey, DateTime, Index
+from sqlalchemy import String, Integer, Text, LargeBinary, ForeignKey, DateTime, Index, CheckConstraint, text
 from app.infrastructure.db.db_session import Base
 from datetime import datetime, timezone
+from typing import Optional
 
 class PostORM(Base):
     __tablename__ = "posts"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Contenido: en texto plano, o en gzip (content_gz) si supera el umbral.
+    # Ambos diferidos: los listados nunca los leen (ver infrastructure/db/post_content.py)
+    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
+    content_gz: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -32,8 +36,10 @@ class PostORM(Base):
     # Índices
     __table_args__ = (
         Index('idx_posts_title', 'title'),
-        Index('idx_posts_created_at', 'created_at'),
+        # Mismo orden que list_recent (created_at DESC NULLS LAST, id DESC)
+        Index('idx_posts_created_at_desc', text('created_at DESC NULLS LAST'), text('id DESC')),
         Index('idx_posts_user_id_created_at', 'user_id', 'created_at'),
+        CheckConstraint('content IS NOT NULL OR content_gz IS NOT NULL', name='ck_posts_content_present'),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,21 @@
+# app/infrastructure/db/models/revoked_token_model.py
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, Index
+from app.infrastructure.db.db_session import Base
+from datetime import datetime
+
+class RevokedTokenORM(Base):
+    """Tokens revocados por logout, identificados por el SHA-256 del token, hasta su `exp`."""
+    __tablename__ = "revoked_tokens"
+
+    token_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Índices
+    __table_args__ = (
+        Index('idx_revoked_tokens_expires_at', 'expires_at'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<RevokedTokenORM(user_id={self.user_id}, expires_at={self.expires_at})>"
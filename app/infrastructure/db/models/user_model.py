@@ -13,6 +13,8 @@ class UserORM(Base):
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Se incrementa al cambiar la contraseña o desactivar: invalida todos los tokens emitidos antes
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,39 @@
+# app/infrastructure/db/post_content.py
+import gzip
+import zlib
+from typing import Iterator, Optional, Tuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+CHUNK_SIZE = 64 * 1024
+
+
+def encode_content(text: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    Devuelve los valores de (content, content_gz) para guardar `text`:
+    por encima del umbral se guarda en gzip y `content` queda a NULL.
+    """
+    raw = text.encode("utf-8")
+    if len(raw) <= settings.POST_CONTENT_COMPRESSION_THRESHOLD:
+        return text, None
+    return None, gzip.compress(raw, compresslevel=settings.POST_CONTENT_COMPRESSION_LEVEL, mtime=0)
+
+
+def decode_content(content: Optional[str], content_gz: Optional[bytes]) -> str:
+    if content_gz is None:
+        return content
+    return gzip.decompress(content_gz).decode("utf-8")
+
+
+def iter_decompressed(content_gz: bytes) -> Iterator[bytes]:
+    """Descomprime por trozos, sin materializar el texto completo."""
+    decompressor = zlib.decompressobj(wbits=31)  # 31 = formato gzip
+    for start in range(0, len(content_gz), CHUNK_SIZE):
+        chunk = decompressor.decompress(content_gz[start:start + CHUNK_SIZE])
+        if chunk:
+            yield chunk
+    tail = decompressor.flush()
+    if tail:
+        yield tail
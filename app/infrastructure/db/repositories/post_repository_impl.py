@@ -1,53 +1,84 @@
 # app/infrastructure/repositories/post_repository_impl.py
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 
 from app.infrastructure.db.models.post_model import PostORM
-from app.schemas.post_schema import PostCreate, PostUpdate, PostResponse
+from app.infrastructure.db.models.user_model import UserORM
+from app.infrastructure.db.post_content import encode_content, decode_content
+from app.schemas.post_schema import PostCreate, PostUpdate, PostResponse, PostListResponse
+from app.schemas.user_schema_basic import UserResponseBasic
 
 class PostRepositoryImpl:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, core_reads: bool = False):
         self.session = session
+        # Lecturas con Core: solo las columnas necesarias, sin identity map ni validación
+        self.core_reads = core_reads
 
     async def create(self, post_data: PostCreate) -> PostResponse:
+        content, content_gz = encode_content(post_data.content)
         new_post = PostORM(
             title=post_data.title,
-            content=post_data.content,
+            content=content,
+            content_gz=content_gz,
             user_id=post_data.user_id,
         )
         self.session.add(new_post)
         await self.session.flush()
         await self.session.commit()
-        await self.session.refresh(new_post)
-        # Recarga el post con la relación author
-        stmt = select(PostORM).options(selectinload(PostORM.author)).where(PostORM.id == new_post.id)
-        result = await self.session.execute(stmt)
-        post_with_author = result.scalar_one()
-        return PostResponse.model_validate(post_with_author)
+        # Recarga el post con la relación author y el contenido
+        return await self.get_by_id(new_post.id)
 
     async def get_by_id(self, post_id: int) -> Optional[PostResponse]:
+        if self.core_reads:
+            row = (await self.session.execute(self._core_detail_select().where(PostORM.id == post_id))).one_or_none()
+            return self._row_to_response(row) if row else None
         stmt = (
             select(PostORM)
             .where(PostORM.id == post_id)
-            .options(selectinload(PostORM.author))
+            .options(selectinload(PostORM.author), undefer(PostORM.content), undefer(PostORM.content_gz))
         )
         result = await self.session.execute(stmt)
         post = result.scalar_one_or_none()
-        return PostResponse.model_validate(post) if post else None
+        return self._orm_to_response(post) if post else None
+
+    async def get_content(self, post_id: int) -> Optional[Tuple[Optional[str], Optional[bytes]]]:
+        """Contenido tal como está guardado: (content, content_gz), sin descomprimir."""
+        stmt = select(PostORM.content, PostORM.content_gz).where(PostORM.id == post_id)
+        row = (await self.session.execute(stmt)).one_or_none()
+        return (row.content, row.content_gz) if row else None
 
-    async def list_posts(self) -> List[PostResponse]:
+    async def list_posts(self) -> List[PostListResponse]:
+        if self.core_reads:
+            result = await self.session.execute(self._core_list_select())
+            return [self._row_to_list_item(row) for row in result]
+        # content/content_gz están diferidos: el listado no los lee
         stmt = select(PostORM).options(selectinload(PostORM.author))
         result = await self.session.execute(stmt)
         posts = result.scalars().all()
-        return [PostResponse.model_validate(post) for post in posts]
+        return [PostListResponse.model_validate(post) for post in posts]
+
+    async def list_recent(self, limit: int) -> List[PostListResponse]:
+        """Últimos `limit` posts con su autor (siempre por Core: recorre idx_posts_created_at_desc)."""
+        stmt = (
+            self._core_list_select()
+            .order_by(PostORM.created_at.desc().nulls_last(), PostORM.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [self._row_to_list_item(row) for row in result]
 
     async def update(self, post_id: int, post_data: PostUpdate) -> Optional[PostResponse]:
+        values = post_data.model_dump(exclude_unset=True)
+        if "content" in values:
+            text = values.pop("content")
+            if text is not None:
+                values["content"], values["content_gz"] = encode_content(text)
         stmt = (
             update(PostORM)
             .where(PostORM.id == post_id)
-            .values(**post_data.model_dump(exclude_unset=True))
+            .values(**values)
         )
         await self.session.execute(stmt)
         await self.session.commit()
@@ -57,3 +88,59 @@ class PostRepositoryImpl:
         result = await self.session.execute(delete(PostORM).where(PostORM.id == post_id))
         await self.session.commit()
         return result.rowcount > 0
+
+    @staticmethod
+    def _orm_to_response(post: PostORM) -> PostResponse:
+        return PostResponse(
+            id=post.id,
+            title=post.title,
+            content=decode_content(post.content, post.content_gz),
+            created_at=post.created_at,
+            updated_at=post.updated_at,
+            author=UserResponseBasic.model_validate(post.author) if post.author else None,
+        )
+
+    # ==========================================================
+    # 🔹 Camino de lectura Core (sin ORM)
+    # ==========================================================
+    @staticmethod
+    def _core_list_select():
+        return select(
+            PostORM.id,
+            PostORM.title,
+            PostORM.created_at,
+            PostORM.updated_at,
+            UserORM.id.label("author_id"),
+            UserORM.username.label("author_username"),
+            UserORM.email.label("author_email"),
+        ).join(UserORM, PostORM.user_id == UserORM.id)
+
+    @classmethod
+    def _core_detail_select(cls):
+        return cls._core_list_select().add_columns(PostORM.content, PostORM.content_gz)
+
+    @staticmethod
+    def _row_to_list_item(row) -> PostListResponse:
+        # Los datos vienen de la BD y ya cumplen el esquema: se construye sin validar
+        return PostListResponse.model_construct(
+            id=row.id,
+            title=row.title,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            author=UserResponseBasic.model_construct(
+                id=row.author_id, username=row.author_username, email=row.author_email
+            ),
+        )
+
+    @staticmethod
+    def _row_to_response(row) -> PostResponse:
+        return PostResponse.model_construct(
+            id=row.id,
+            title=row.title,
+            content=decode_content(row.content, row.content_gz),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            author=UserResponseBasic.model_construct(
+                id=row.author_id, username=row.author_username, email=row.author_email
+            ),
+        )
@@ -1,16 +1,30 @@
 # app/infrastructure/repositories/user_repository_impl.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from datetime import datetime, timezone
+from sqlalchemy import select, update, delete, literal, exists
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 from app.infrastructure.db.models.user_model import UserORM
+from app.infrastructure.db.models.post_model import PostORM
+from app.infrastructure.db.models.revoked_token_model import RevokedTokenORM
 from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
+from app.schemas.post_schema_basic import PostResponseBasic
+from app.schemas.auth_schema import AuthState, UserCredentials
 from app.core.security import hash_password
+from app.core.exceptions import DuplicateUserError
+from app.infrastructure.services.cache_service import token_cache, auth_invalidation_statement
+from app.infrastructure.services.availability_index import availability_index
+
+UNIQUE_VIOLATION = "23505"
+
 
 class UserRepositoryImpl:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, core_reads: bool = False):
         self.session = session
+        # Lecturas con Core: solo las columnas necesarias, sin identity map ni validación
+        self.core_reads = core_reads
 
     async def create(self, user_data: UserCreate) -> UserResponse:
         new_user = UserORM(
@@ -19,7 +33,8 @@ class UserRepositoryImpl:
             hashed_password=user_data.password,
         )
         self.session.add(new_user)
-        await self.session.commit()
+        await self._commit_unique()
+        availability_index.add(new_user.username, new_user.email)
         await self.session.refresh(new_user)
         # Carga posts de forma eager
         stmt = select(UserORM).options(selectinload(UserORM.posts)).where(UserORM.id == new_user.id)
@@ -28,6 +43,9 @@ class UserRepositoryImpl:
         return UserResponse.model_validate(user_with_posts)
 
     async def get_by_id(self, user_id: int) -> Optional[UserResponse]:
+        if self.core_reads:
+            users = await self._core_list(UserORM.id == user_id)
+            return users[0] if users else None
         stmt = select(UserORM).options(selectinload(UserORM.posts)).where(UserORM.id == user_id)
         result = await self.session.execute(stmt)
         user = result.scalar_one_or_none()
@@ -36,12 +54,61 @@ class UserRepositoryImpl:
         return None
 
     async def get_by_username(self, username: str) -> Optional[UserResponse]:
-        stmt = select(UserORM).where(UserORM.username == username)
+        if self.core_reads:
+            users = await self._core_list(UserORM.username == username)
+            return users[0] if users else None
+        # UserResponse incluye posts: se cargan en la misma sesión (evita MissingGreenlet)
+        stmt = select(UserORM).options(selectinload(UserORM.posts)).where(UserORM.username == username)
         result = await self.session.execute(stmt)
         user = result.scalar_one_or_none()
         return UserResponse.model_validate(user) if user else None
 
+    async def get_credentials(self, username: str) -> Optional[UserCredentials]:
+        stmt = select(
+            UserORM.id, UserORM.username, UserORM.email, UserORM.is_active,
+            UserORM.hashed_password, UserORM.token_version,
+        ).where(UserORM.username == username)
+        row = (await self.session.execute(stmt)).one_or_none()
+        return UserCredentials.model_validate(dict(row._mapping)) if row else None
+
+    async def get_auth_state(self, user_id: int, token_hash: str) -> Optional[AuthState]:
+        # Usuario, versión de tokens y revocación del token en una sola consulta
+        revoked = exists().where(RevokedTokenORM.token_hash == token_hash)
+        stmt = select(
+            UserORM.id, UserORM.username, UserORM.email, UserORM.is_active,
+            UserORM.token_version, revoked.label("revoked"),
+        ).where(UserORM.id == user_id)
+        row = (await self.session.execute(stmt)).one_or_none()
+        return AuthState.model_validate(dict(row._mapping)) if row else None
+
+    async def revoke_token(self, token_hash: str, user_id: int, expires_at: float) -> None:
+        """Registra el logout en la BD y lo difunde a todos los workers al confirmar."""
+        now = datetime.now(timezone.utc)
+        # Las revocaciones de tokens ya expirados no aportan nada
+        await self.session.execute(delete(RevokedTokenORM).where(RevokedTokenORM.expires_at <= now))
+        self.session.add(RevokedTokenORM(
+            token_hash=token_hash,
+            user_id=user_id,
+            expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+        ))
+        await self.session.execute(
+            auth_invalidation_statement(type="token", token_hash=token_hash, expires_at=expires_at)
+        )
+        await self.session.commit()
+        token_cache.revoke(token_hash, expires_at)
+
+    async def username_exists(self, username: str) -> bool:
+        # SELECT 1 ... LIMIT 1: se resuelve con un index-only scan sobre la constraint única
+        stmt = select(literal(1)).where(UserORM.username == username).limit(1)
+        return (await self.session.execute(stmt)).first() is not None
+
+    async def email_exists(self, email: str) -> bool:
+        stmt = select(literal(1)).where(UserORM.email == email).limit(1)
+        return (await self.session.execute(stmt)).first() is not None
+
     async def list_all(self) -> List[UserResponse]:
+        if self.core_reads:
+            return await self._core_list()
         stmt = select(UserORM).options(selectinload(UserORM.posts))
         result = await self.session.execute(stmt)
         users = result.scalars().all()
@@ -52,18 +119,72 @@ class UserRepositoryImpl:
         if "password" in update_data:
             # Hashea el password y cambia la clave
             update_data["hashed_password"] = hash_password(update_data.pop("password"))
+        # Cambios de password o is_active invalidan los tokens emitidos en todos los workers
+        invalidate = "hashed_password" in update_data or "is_active" in update_data
+        if invalidate:
+            update_data["token_version"] = UserORM.token_version + 1
         stmt = (
             update(UserORM)
             .where(UserORM.id == user_id)
             .values(**update_data)
             .execution_options(synchronize_session="fetch")
         )
-        await self.session.execute(stmt)
-        await self.session.commit()
+        statements = [stmt]
+        if invalidate:
+            statements.append(auth_invalidation_statement(type="user", user_id=user_id))
+        await self._commit_unique(*statements)
+        availability_index.add(update_data.get("username"), update_data.get("email"))
+        if invalidate:
+            token_cache.invalidate_user(user_id)
         # Devuelve el usuario actualizado
         return await self.get_by_id(user_id)
 
     async def delete(self, user_id: int) -> bool:
         result = await self.session.execute(delete(UserORM).where(UserORM.id == user_id))
+        await self.session.execute(auth_invalidation_statement(type="user", user_id=user_id))
         await self.session.commit()
+        token_cache.invalidate_user(user_id)
         return result.rowcount > 0
+
+    async def _commit_unique(self, *statements) -> None:
+        """Ejecuta `statements` en una transacción y hace commit, traduciendo duplicados a DuplicateUserError."""
+        try:
+            for stmt in statements:
+                await self.session.execute(stmt)
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            # Solo las violaciones de unicidad (23505) son duplicados; el resto se propaga
+            if getattr(e.orig, "sqlstate", None) != UNIQUE_VIOLATION:
+                raise
+            raise DuplicateUserError("El username o el email ya están registrados") from e
+
+    # ==========================================================
+    # 🔹 Camino de lectura Core (sin ORM)
+    # ==========================================================
+    async def _core_list(self, *criteria) -> List[UserResponse]:
+        users_stmt = select(
+            UserORM.id, UserORM.username, UserORM.email, UserORM.created_at, UserORM.updated_at
+        ).where(*criteria)
+        posts_stmt = select(PostORM.id, PostORM.title, PostORM.user_id)
+        if criteria:
+            posts_stmt = posts_stmt.where(PostORM.user_id.in_(select(UserORM.id).where(*criteria)))
+
+        posts_by_user: Dict[int, List[PostResponseBasic]] = {}
+        for row in await self.session.execute(posts_stmt):
+            posts_by_user.setdefault(row.user_id, []).append(
+                PostResponseBasic.model_construct(id=row.id, title=row.title)
+            )
+
+        # Los datos vienen de la BD y ya cumplen el esquema: se construye sin validar
+        return [
+            UserResponse.model_construct(
+                id=row.id,
+                username=row.username,
+                email=row.email,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+                posts=posts_by_user.get(row.id, []),
+            )
+            for row in await self.session.execute(users_stmt)
+        ]
@@ -0,0 +1,146 @@
+# app/infrastructure/services/availability_index.py
+import asyncio
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.infrastructure.db.db_session import AsyncSessionLocal
+from app.infrastructure.db.models.user_model import UserORM
+from app.infrastructure.services.bloom_filter import BloomFilter
+from app.infrastructure.services.pg_listener import PgListener, pg_listener
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH_SIZE = 10000
+
+# Canal NOTIFY del trigger `users_notify_availability` (altas y cambios de username/email)
+CHANNEL = "user_availability"
+
+
+class AvailabilityIndex:
+    """
+    Índice probabilístico (por worker) de usernames y emails existentes.
+
+    Un "no está" del filtro evita ir a la BD; un "puede estar" se confirma con una
+    consulta. Las altas y cambios de cualquier worker llegan por NOTIFY (CHANNEL), y
+    tras cada (re)conexión del listener el filtro se recarga desde `users`. Mientras
+    el listener no está conectado el filtro podría haberse quedado atrás, así que
+    no se usa para descartar: todo se consulta en la BD.
+    Los borrados no se reflejan (solo generan falsos positivos) hasta la siguiente
+    reconstrucción periódica. La unicidad real la garantizan las constraints de `users`.
+    """
+
+    def __init__(self, listener: PgListener, capacity: int, error_rate: float, refresh_seconds: int):
+        self.listener = listener
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.usernames: Optional[BloomFilter] = None
+        self.emails: Optional[BloomFilter] = None
+        self._pending: Optional[List[Tuple[Optional[str], Optional[str]]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()  # recarga periódica y resync no se solapan
+
+    # ==========================================================
+    # 🔹 Ciclo de vida (lifespan)
+    # ==========================================================
+    async def start(self) -> None:
+        # La carga inicial (y tras cada reconexión) la hace el listener ya escuchando CHANNEL
+        self.listener.add_listener(CHANNEL, self._on_notify)
+        self.listener.add_reconnect_callback(self._resync)
+        self._task = asyncio.create_task(self._run(), name="availability-index")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        # Reconstrucción periódica: descarta usuarios borrados y redimensiona los filtros
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self._reload()
+
+    async def _resync(self) -> None:
+        # Sin escuchar pudieron perderse altas: el filtro anterior ya no sirve para descartar
+        self.usernames = self.emails = None
+        await self._reload()
+
+    async def _reload(self) -> None:
+        try:
+            async with self._load_lock:
+                await self.load()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"No se pudo cargar el índice de disponibilidad: {e}")
+
+    def _on_notify(self, payload: str) -> None:
+        event = json.loads(payload)
+        self.add(event.get("username"), event.get("email"))
+
+    async def load(self) -> None:
+        """Reconstruye ambos filtros desde `users` y los sustituye de una vez."""
+        self._pending = []
+        try:
+            async with AsyncSessionLocal() as session:
+                total = (await session.execute(select(func.count()).select_from(UserORM))).scalar_one()
+                capacity = max(self.capacity, total * 2)
+                usernames = BloomFilter(capacity, self.error_rate)
+                emails = BloomFilter(capacity, self.error_rate)
+                stmt = select(UserORM.username, UserORM.email).execution_options(yield_per=LOAD_BATCH_SIZE)
+                result = await session.stream(stmt)
+                async for batch in result.partitions():
+                    for username, email in batch:
+                        usernames.add(username)
+                        emails.add(email)
+            # Altas confirmadas mientras se cargaba
+            for username, email in self._pending:
+                if username:
+                    usernames.add(username)
+                if email:
+                    emails.add(email)
+            self.usernames, self.emails = usernames, emails
+            logger.info(f"Índice de disponibilidad cargado ({total} usuarios)")
+        finally:
+            self._pending = None
+
+    # ==========================================================
+    # 🔹 Consultas y altas
+    # ==========================================================
+    def add(self, username: Optional[str] = None, email: Optional[str] = None) -> None:
+        if self._pending is not None:
+            self._pending.append((username, email))
+        if username and self.usernames is not None:
+            self.usernames.add(username)
+        if email and self.emails is not None:
+            self.emails.add(email)
+
+    @property
+    def ready(self) -> bool:
+        """El filtro está cargado y al día con las altas de todos los workers."""
+        return self.usernames is not None and self.listener.connected.is_set()
+
+    def might_contain_username(self, username: str) -> bool:
+        # Sin filtro al día no se puede descartar nada: se consulta la BD
+        return not self.ready or username in self.usernames
+
+    def might_contain_email(self, email: str) -> bool:
+        return not self.ready or email in self.emails
+
+
+settings = get_settings()
+
+# Índice de disponibilidad de usernames/emails (uno por worker)
+availability_index = AvailabilityIndex(
+    listener=pg_listener,
+    capacity=settings.AVAILABILITY_FILTER_CAPACITY,
+    error_rate=settings.AVAILABILITY_FILTER_ERROR_RATE,
+    refresh_seconds=settings.AVAILABILITY_REFRESH_SECONDS,
+)
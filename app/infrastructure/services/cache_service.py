@@ -0,0 +1,186 @@
+# app/infrastructure/services/cache_service.py
+import heapq
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Canal NOTIFY por el que se difunden logouts e invalidaciones de usuario a todos los workers
+AUTH_INVALIDATION_CHANNEL = "auth_invalidation"
+
+
+class TTLCache:
+    """
+    Caché en memoria (por worker) acotada en tamaño, con expiración por entrada.
+    Al llenarse desaloja la entrada usada hace más tiempo (LRU).
+    `on_evict(key, value)` se llama cada vez que una entrada sale de la caché.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            self.pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Guarda `value` hasta `expires_at` (epoch), nunca más allá del TTL de la caché."""
+        limit = time.time() + self.ttl_seconds
+        self._data[key] = (min(expires_at, limit) if expires_at else limit, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            old_key, (_, old_value) = self._data.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(old_key, old_value)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        if self.on_evict:
+            self.on_evict(key, entry[1])
+        return entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def keys(self) -> List[Hashable]:
+        """Claves en orden LRU (la primera es la próxima en desalojarse)."""
+        return list(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        # No actualiza el orden LRU
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.time()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class VerifiedTokenCache:
+    """
+    Caché de tokens JWT ya verificados junto con el usuario activo que representan,
+    indexada por hash del token. Cada entrada vive como mucho hasta el `exp` del token.
+
+    - `revoke` invalida un token concreto (logout) hasta su expiración.
+    - `invalidate_user` descarta todos los tokens de un usuario (desactivación, borrado).
+      La generación por usuario evita re-cachear un usuario leído antes de invalidarlo.
+    La fuente de verdad está en la BD (`revoked_tokens`, `users.token_version`); esta
+    caché se mantiene al día en todos los workers con AUTH_INVALIDATION_CHANNEL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._tokens = TTLCache(max_size, ttl_seconds, on_evict=self._forget)
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._generations: Dict[int, int] = {}
+        self._revoked: Dict[str, float] = {}
+        self._revoked_expiry: List[Tuple[float, str]] = []  # heap (exp, clave) para purgar
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.is_revoked(key):
+            return None
+        entry = self._tokens.get(key)
+        return entry[1] if entry else None
+
+    def generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, 0)
+
+    def set(self, key: str, user_id: int, value: Any, expires_at: float, generation: int) -> None:
+        if generation != self.generation(user_id) or self.is_revoked(key):
+            return
+        self._tokens.set(key, (user_id, value), expires_at)
+        self._tokens_by_user.setdefault(user_id, set()).add(key)
+
+    def _forget(self, key: str, entry: Tuple[int, Any]) -> None:
+        # Mantiene el índice por usuario al salir una entrada de la caché
+        user_id = entry[0]
+        keys = self._tokens_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tokens_by_user[user_id]
+
+    def revoke(self, key: str, expires_at: float) -> None:
+        now = time.time()
+        while self._revoked_expiry and self._revoked_expiry[0][0] <= now:
+            _, expired = heapq.heappop(self._revoked_expiry)
+            if self._revoked.get(expired, now + 1) <= now:
+                del self._revoked[expired]
+        self._revoked[key] = expires_at
+        heapq.heappush(self._revoked_expiry, (expires_at, key))
+        self._tokens.pop(key)
+
+    def is_revoked(self, key: str) -> bool:
+        expires_at = self._revoked.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._generations[user_id] = self.generation(user_id) + 1
+        for key in list(self._tokens_by_user.get(user_id, ())):
+            self._tokens.pop(key)
+
+    def clear(self) -> None:
+        """Vacía la caché; las siguientes requests vuelven a verificar contra la BD."""
+        for user_id in list(self._tokens_by_user):
+            self._generations[user_id] = self.generation(user_id) + 1
+        self._tokens.clear()
+        self._tokens_by_user.clear()
+        self._revoked.clear()
+        self._revoked_expiry.clear()
+
+
+# ==========================================================
+# 🔹 Difusión de invalidaciones entre workers
+# ==========================================================
+def auth_invalidation_statement(**event):
+    """
+    Sentencia `SELECT pg_notify(...)` para ejecutar dentro de la misma transacción
+    que el cambio: Postgres solo la entrega a los workers si la transacción confirma.
+    """
+    return select(func.pg_notify(AUTH_INVALIDATION_CHANNEL, json.dumps(event)))
+
+
+def handle_auth_invalidation(payload: str) -> None:
+    event = json.loads(payload)
+    if event["type"] == "token":
+        token_cache.revoke(event["token_hash"], event["expires_at"])
+    elif event["type"] == "user":
+        token_cache.invalidate_user(event["user_id"])
+    else:
+        logger.warning(f"Invalidación de auth desconocida: {payload}")
+
+
+async def reset_token_cache() -> None:
+    """Tras (re)conectar el listener pudo perderse alguna invalidación: se vacía la caché."""
+    token_cache.clear()
+
+
+settings = get_settings()
+
+# Caché de tokens verificados (por worker)
+token_cache = VerifiedTokenCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
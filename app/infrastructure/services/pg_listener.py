@@ -0,0 +1,92 @@
+# app/infrastructure/services/pg_listener.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 5
+
+NotifyCallback = Callable[[str], None]
+ReconnectCallback = Callable[[], Awaitable[None]]
+
+
+class PgListener:
+    """
+    Conexión LISTEN compartida (una por worker) para todos los canales de NOTIFY.
+
+    - `add_listener(canal, callback)` registra un callback síncrono que recibe el payload.
+    - `add_reconnect_callback(cb)` se ejecuta tras cada (re)conexión, incluida la primera:
+      los consumidores lo usan para recuperar lo que pudieron perderse sin escuchar.
+    Los callbacks deben registrarse antes de `start()`.
+    """
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.connected = asyncio.Event()
+        self._listeners: Dict[str, List[NotifyCallback]] = {}
+        self._reconnect_callbacks: List[ReconnectCallback] = []
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, channel: str, callback: NotifyCallback) -> None:
+        self._listeners.setdefault(channel, []).append(callback)
+
+    def add_reconnect_callback(self, callback: ReconnectCallback) -> None:
+        self._reconnect_callbacks.append(callback)
+
+    # ==========================================================
+    # 🔹 Ciclo de vida (lifespan)
+    # ==========================================================
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="pg-listener")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                self._connection.add_termination_listener(lambda _conn: lost.set())
+                for channel in self._listeners:
+                    await self._connection.add_listener(channel, self._on_notify)
+                logger.info(f"Escuchando NOTIFY en {sorted(self._listeners)}")
+                for callback in self._reconnect_callbacks:
+                    await callback()
+                self.connected.set()
+                await lost.wait()
+                logger.warning("Conexión LISTEN perdida; reconectando...")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Error en la conexión LISTEN: {e}; reintentando en {RECONNECT_DELAY_SECONDS}s")
+            finally:
+                self.connected.clear()
+                if self._connection is not None and not self._connection.is_closed():
+                    await self._connection.close()
+                self._connection = None
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def _on_notify(self, connection, pid, channel: str, payload: str) -> None:
+        for callback in self._listeners.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception(f"Error procesando NOTIFY del canal '{channel}'")
+
+
+settings = get_settings()
+
+# Conexión LISTEN compartida (una por worker)
+pg_listener = PgListener(settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"))
@@ -0,0 +1,202 @@
+# app/infrastructure/services/post_change_feed.py
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Deque, List, Optional, Set
+
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.infrastructure.db.db_session import AsyncSessionLocal
+from app.infrastructure.db.models.post_event_model import PostEventORM
+from app.infrastructure.services.pg_listener import PgListener, pg_listener
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "post_changes"
+PRUNE_INTERVAL_SECONDS = 3600
+EVENTS_PAGE_SIZE = 1000
+
+
+class Subscriber:
+    """Cola acotada de un cliente del stream. Si se llena, el cliente se descarta."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class PostChangeFeed:
+    """
+    Feed de cambios de posts por worker: escucha el canal `post_changes` en la
+    conexión LISTEN compartida y reparte cada notificación a todos los
+    suscriptores (fan-out en memoria).
+
+    - Guarda los últimos eventos en un buffer circular para reanudar sin ir a la BD;
+      si el cliente pide un id más antiguo, se lee de `post_events`.
+    - Los suscriptores lentos (cola llena) se descartan para no frenar al resto.
+    - Tras cada (re)conexión del listener recupera los eventos perdidos.
+
+    Los ids se asignan al insertar, así que transacciones concurrentes pueden
+    confirmarse fuera de orden: la reanudación por id es best-effort.
+    """
+
+    def __init__(self, listener: PgListener, queue_size: int, buffer_size: int, retention_hours: int):
+        self.listener = listener
+        self.queue_size = queue_size
+        self.retention = timedelta(hours=retention_hours)
+        self.buffer: Deque[dict] = deque(maxlen=buffer_size)
+        self._buffered_ids: Set[int] = set()  # ids del buffer, para no repartir dos veces el mismo evento
+        self._held: Optional[List[dict]] = None  # notificaciones recibidas durante _catch_up
+        self.subscribers: Set[Subscriber] = set()
+        self.last_id: Optional[int] = None
+        self._prune_task: Optional[asyncio.Task] = None
+
+    # ==========================================================
+    # 🔹 Ciclo de vida (lifespan)
+    # ==========================================================
+    async def start(self) -> None:
+        """Se registra en la conexión LISTEN compartida (arrancarla después)."""
+        self.listener.add_listener(CHANNEL, self._on_notify)
+        self.listener.add_reconnect_callback(self._catch_up)
+        self._prune_task = asyncio.create_task(self._prune_periodically(), name="post-events-prune")
+
+    async def stop(self) -> None:
+        if self._prune_task:
+            self._prune_task.cancel()
+            try:
+                await self._prune_task
+            except asyncio.CancelledError:
+                pass
+        for subscriber in list(self.subscribers):
+            self._drop(subscriber)
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+            try:
+                await self._prune()
+            except Exception as e:
+                logger.warning(f"No se pudo purgar post_events: {e}")
+
+    # ==========================================================
+    # 🔹 Notificaciones y fan-out
+    # ==========================================================
+    def _on_notify(self, payload: str) -> None:
+        event = json.loads(payload)
+        if self._held is not None:
+            self._held.append(event)
+        else:
+            self._dispatch(event)
+
+    def _dispatch(self, event: dict) -> None:
+        if event["id"] in self._buffered_ids:
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self._buffered_ids.discard(self.buffer[0]["id"])
+        self.buffer.append(event)
+        self._buffered_ids.add(event["id"])
+        self.last_id = max(event["id"], self.last_id or 0)
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.info("Suscriptor lento descartado del stream de posts")
+                self._drop(subscriber)
+
+    async def _catch_up(self) -> None:
+        """Tras (re)conectar, reparte todos los eventos confirmados mientras no escuchábamos."""
+        if self.last_id is None:
+            return
+        # Las notificaciones que llegan mientras se pagina se retienen y se reparten al
+        # final, para no adelantarse a los eventos perdidos (las ya leídas se descartan).
+        # Un hueco grande llena las colas y descarta a los suscriptores: al reconectar
+        # con Last-Event-ID se reanudan desde donde se quedaron
+        self._held = []
+        paged: Set[int] = set()
+        try:
+            async for event in self._iter_events_after(self.last_id):
+                paged.add(event["id"])
+                self._dispatch(event)
+        finally:
+            held, self._held = self._held, None
+            for event in held:
+                if event["id"] not in paged:
+                    self._dispatch(event)
+
+    # ==========================================================
+    # 🔹 Suscripción
+    # ==========================================================
+    async def subscribe(self, last_event_id: Optional[int] = None) -> tuple:
+        """
+        Registra un suscriptor y devuelve (suscriptor, iterador asíncrono de eventos a re-enviar).
+        Se registra antes de calcular la reanudación para no perder eventos entre medias.
+        """
+        subscriber = Subscriber(self.queue_size)
+        self.subscribers.add(subscriber)
+        return subscriber, self._replay(last_event_id)
+
+    async def _replay(self, last_event_id: Optional[int]) -> AsyncIterator[dict]:
+        if last_event_id is None:
+            return
+        if self.buffer and self.buffer[0]["id"] <= last_event_id + 1:
+            for event in [e for e in self.buffer if e["id"] > last_event_id]:
+                yield event
+            return
+        # Fuera del buffer: se pagina post_events hasta alcanzar el presente
+        async for event in self._iter_events_after(last_event_id):
+            yield event
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        subscriber.dropped = True
+        self.subscribers.discard(subscriber)
+        # Vacía la cola y deja un centinela para que el stream termine
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    # ==========================================================
+    # 🔹 Acceso a post_events
+    # ==========================================================
+    async def _iter_events_after(self, event_id: int) -> AsyncIterator[dict]:
+        """Todos los eventos posteriores a `event_id`, de EVENTS_PAGE_SIZE en EVENTS_PAGE_SIZE."""
+        while True:
+            page = await self._events_after(event_id)
+            for event in page:
+                yield event
+            if len(page) < EVENTS_PAGE_SIZE:
+                return
+            event_id = page[-1]["id"]
+
+    async def _events_after(self, event_id: int, limit: int = EVENTS_PAGE_SIZE) -> List[dict]:
+        stmt = (
+            select(PostEventORM.id, PostEventORM.op, PostEventORM.post_id)
+            .where(PostEventORM.id > event_id)
+            .order_by(PostEventORM.id)
+            .limit(limit)
+        )
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(stmt)).all()
+        return [{"id": row.id, "op": row.op, "post_id": row.post_id} for row in rows]
+
+    async def _prune(self) -> None:
+        cutoff = datetime.now(timezone.utc) - self.retention
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(PostEventORM).where(PostEventORM.created_at < cutoff))
+            await session.commit()
+
+
+settings = get_settings()
+
+# Feed de cambios de posts (uno por worker)
+post_change_feed = PostChangeFeed(
+    listener=pg_listener,
+    queue_size=settings.POST_STREAM_QUEUE_SIZE,
+    buffer_size=settings.POST_STREAM_BUFFER_SIZE,
+    retention_hours=settings.POST_EVENTS_RETENTION_HOURS,
+)
@@ -0,0 +1,100 @@
+# app/infrastructure/services/recent_posts_snapshot.py
+import asyncio
+import gzip
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.infrastructure.db.db_session import AsyncSessionLocal
+from app.infrastructure.db.repositories.post_repository_impl import PostRepositoryImpl
+from app.schemas.post_schema import PostListResponse
+
+logger = logging.getLogger(__name__)
+
+_posts_adapter = TypeAdapter(List[PostListResponse])
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Listado ya serializado, listo para enviar tal cual."""
+    body: bytes
+    body_gz: bytes
+    etag: str
+    count: int
+    built_at: float  # time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+
+class RecentPostsSnapshot:
+    """
+    Snapshot en memoria (por worker) de los últimos N posts con su autor.
+    Una tarea en segundo plano lo reconstruye cada `refresh_seconds` y lo
+    sustituye de una vez: las lecturas nunca ven un snapshot a medias ni usan la BD.
+    """
+
+    def __init__(self, size: int, refresh_seconds: int):
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self.current: Optional[Snapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        metrics.gauge("recent_posts_snapshot_age_seconds", self._age)
+
+    def _age(self) -> float:
+        return self.current.age if self.current else -1.0
+
+    # ==========================================================
+    # 🔹 Ciclo de vida (lifespan)
+    # ==========================================================
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="recent-posts-snapshot")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Se sigue sirviendo el snapshot anterior
+                metrics.inc("recent_posts_snapshot_refresh_errors_total")
+                logger.warning(f"No se pudo reconstruir el snapshot de posts recientes: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def refresh(self) -> None:
+        async with AsyncSessionLocal() as session:
+            posts = await PostRepositoryImpl(session).list_recent(self.size)
+        body = _posts_adapter.dump_json(posts)
+        self.current = Snapshot(
+            body=body,
+            body_gz=gzip.compress(body, mtime=0),
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            count=len(posts),
+            built_at=time.time(),
+        )
+        metrics.inc("recent_posts_snapshot_refreshes_total")
+
+
+settings = get_settings()
+
+# Snapshot de posts recientes (uno por worker)
+recent_posts_snapshot = RecentPostsSnapshot(
+    size=settings.RECENT_POSTS_SNAPSHOT_SIZE,
+    refresh_seconds=settings.RECENT_POSTS_REFRESH_SECONDS,
+)
@@ -1,5 +1,5 @@
 # app/interfaces/repositories/post_repository.py
-from typing import Protocol, List, Optional
+from typing import Protocol, List, Optional, Tuple
 from uuid import UUID
 from app.domain.models.post import Post as DomainPost
 
@@ -11,9 +11,16 @@ class IPostRepository(Protocol):
     async def get_by_id(self, post_id: UUID) -> Optional[DomainPost]:
         ...
 
+    async def get_content(self, post_id: int) -> Optional[Tuple[Optional[str], Optional[bytes]]]:
+        """(content, content_gz) tal como están guardados."""
+        ...
+
     async def list_all(self) -> List[DomainPost]:
         ...
 
+    async def list_recent(self, limit: int) -> List[DomainPost]:
+        ...
+
     async def list_by_user(self, user_id: UUID) -> List[DomainPost]:
         ...
 
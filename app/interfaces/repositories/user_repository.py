@@ -2,6 +2,7 @@
 from typing import Protocol, List, Optional
 from uuid import UUID
 from app.domain.models.user import User as DomainUser
+from app.schemas.auth_schema import AuthState, UserCredentials
 
 
 class IUserRepository(Protocol):
@@ -14,6 +15,21 @@ class IUserRepository(Protocol):
     async def get_by_username(self, username: str) -> Optional[DomainUser]:
         ...
 
+    async def get_credentials(self, username: str) -> Optional[UserCredentials]:
+        ...
+
+    async def get_auth_state(self, user_id: int, token_hash: str) -> Optional[AuthState]:
+        ...
+
+    async def revoke_token(self, token_hash: str, user_id: int, expires_at: float) -> None:
+        ...
+
+    async def username_exists(self, username: str) -> bool:
+        ...
+
+    async def email_exists(self, email: str) -> bool:
+        ...
+
     async def list_all(self) -> List[DomainUser]:
         ...
 
@@ -1,12 +1,26 @@
 # app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
 from contextlib import asynccontextmanager
 from app.core.config import get_settings
 import logging
 from app.core.logging_config import setup_logging
 
-from app.api.v1.endpoints import user_router, post_router  # Routers
-from app.infrastructure.db.db_session import dispose_db     # Cierre DB
+from app.api.v1.endpoints import user_router, post_router, auth_router, metrics_router  # Routers
+from app.api.middleware.negotiation import ContentNegotiationMiddleware
+from app.api.middleware.request_context import RequestContextMiddleware
+from app.api.middleware.profiling import ProfilingMiddleware
+from app.api.middleware.disconnect import DisconnectMiddleware
+from app.core.profiling import install_db_timing
+from app.infrastructure.db.db_session import engine, dispose_db     # Cierre DB
+from app.infrastructure.services.pg_listener import pg_listener
+from app.infrastructure.services.post_change_feed import post_change_feed
+from app.infrastructure.services.cache_service import (
+    AUTH_INVALIDATION_CHANNEL, handle_auth_invalidation, reset_token_cache,
+)
+from app.infrastructure.services.availability_index import availability_index
+from app.infrastructure.services.recent_posts_snapshot import recent_posts_snapshot
 
 # Inicializar logging global
 setup_logging()
@@ -20,8 +34,19 @@ async def lifespan(app: FastAPI):
     Lifespan de la aplicación: inicio y cierre de recursos.
     """
     logger.info("🚀 Aplicación iniciando...")
+    # Los consumidores de NOTIFY se registran antes de arrancar la conexión LISTEN
+    pg_listener.add_listener(AUTH_INVALIDATION_CHANNEL, handle_auth_invalidation)
+    pg_listener.add_reconnect_callback(reset_token_cache)
+    await post_change_feed.start()
+    await availability_index.start()
+    await recent_posts_snapshot.start()
+    await pg_listener.start()
     yield
     logger.info("🛑 Aplicación cerrándose...")
+    await pg_listener.stop()
+    await recent_posts_snapshot.stop()
+    await availability_index.stop()
+    await post_change_feed.stop()
     # Cerrar el engine de SQLAlchemy Async
     await dispose_db()
 
@@ -29,15 +54,44 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.APP_NAME,
         debug=settings.is_debug,
-        lifespan=lifespan
+        lifespan=lifespan,
     )
 
+    # Middlewares
+    app.add_middleware(
+        ContentNegotiationMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        threadpool_min_bytes=settings.COMPRESSION_THREADPOOL_MIN_BYTES,
+    )
+    if settings.PROFILING_ENABLED and settings.PROFILING_SECRET:
+        install_db_timing(engine)
+        app.add_middleware(
+            ProfilingMiddleware,
+            secret=settings.PROFILING_SECRET,
+            output_dir=settings.PROFILING_OUTPUT_DIR,
+            interval_ms=settings.PROFILING_INTERVAL_MS,
+        )
+    app.add_middleware(RequestContextMiddleware)
+    app.add_middleware(DisconnectMiddleware)  # El último añadido es el más externo
+
+    # Errores
+    @app.exception_handler(DBAPIError)
+    async def db_error_handler(request: Request, exc: DBAPIError):
+        # 57014 = query_canceled: se agotó el statement_timeout de la request
+        if getattr(exc.orig, "sqlstate", None) == "57014":
+            return JSONResponse(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                content={"detail": "La consulta superó el tiempo límite de la petición"},
+            )
+        raise exc
+
     # Routers
+    app.include_router(auth_router.router, prefix="/auth", tags=["Auth"])
     app.include_router(user_router.router, prefix="/users", tags=["Users"])
     app.include_router(post_router.router, prefix="/posts", tags=["Posts"])
-    # Si en un futuro agregamos auth_router:
-    # from app.api.v1.endpoints import auth_router
-    # app.include_router(auth_router.router, prefix="/auth", tags=["Auth"])
+    app.include_router(metrics_router.router, prefix="/metrics", tags=["Metrics"])
 
     return app
 
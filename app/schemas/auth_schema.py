@@ -0,0 +1,23 @@
+# app/schemas/auth_schema.py
+from pydantic import BaseModel
+from app.schemas.user_schema_basic import UserResponseBasic
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int  # segundos
+
+
+class AuthenticatedUser(UserResponseBasic):
+    is_active: bool
+
+
+class UserCredentials(AuthenticatedUser):
+    hashed_password: str
+    token_version: int
+
+
+class AuthState(AuthenticatedUser):
+    """Estado de autenticación de un token (uso interno, no se expone en la API)."""
+    token_version: int
+    revoked: bool
@@ -16,6 +16,16 @@ class PostUpdate(BaseModel):
     content: Optional[str] = None
 
 
+class PostListResponse(PostResponseBasic):
+    """Elemento de listado: sin `content` (se obtiene en el detalle o en /posts/{id}/content)."""
+    created_at: datetime
+    updated_at: datetime
+    author: Optional[UserResponseBasic] = None
+
+    class Config:
+        from_attributes = True
+
+
 class PostResponse(PostResponseBasic):
     content: str
     created_at: datetime
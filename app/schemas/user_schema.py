@@ -1,5 +1,5 @@
 # app/schemas/user_schema.py
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime
 from typing import List, Optional
 from app.schemas.post_schema_basic import PostResponseBasic
@@ -16,6 +16,14 @@ class UserUpdate(BaseModel):
     username: Optional[str] = Field(None, min_length=3, max_length=50)
     password: Optional[str] = Field(None, min_length=6)
 
+    @field_validator("*", mode="before")
+    @classmethod
+    def reject_null(cls, value):
+        # Omitir un campo lo deja como está; enviarlo a null no es un cambio válido
+        if value is None:
+            raise ValueError("no puede ser null")
+        return value
+
 
 class UserResponse(UserResponseBasic):
     created_at: datetime
@@ -24,3 +32,8 @@ class UserResponse(UserResponseBasic):
 
     class Config:
         from_attributes = True
+
+
+class AvailabilityResponse(BaseModel):
+    username_available: Optional[bool] = None
+    email_available: Optional[bool] = None
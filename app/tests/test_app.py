@@ -0,0 +1,172 @@
+# app/tests/test_app.py
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def test_openapi_schema_is_served():
+    client = TestClient(create_app())
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert "/posts/" in response.json()["paths"]
+
+
+def test_metrics_endpoint_renders_prometheus_text():
+    client = TestClient(create_app())
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+def test_profile_file_name_ignores_client_request_id(tmp_path):
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+    from app.api.middleware.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+    from app.api.middleware.request_context import RequestContextMiddleware
+
+    inner = Starlette(routes=[Route("/", lambda request: PlainTextResponse("ok"))])
+    output_dir = tmp_path / "profiles"
+    app = RequestContextMiddleware(ProfilingMiddleware(inner, secret="s3cret", output_dir=str(output_dir)))
+    response = TestClient(app).get("/", headers={"X-Profile": "s3cret", "X-Request-ID": "../../escape"})
+    profile_id = response.headers[PROFILE_ID_HEADER]
+    assert profile_id != "../../escape"
+    assert [p.name for p in output_dir.iterdir()] == [f"{profile_id}.folded"]
+    assert not (tmp_path.parent / "escape.folded").exists()
+
+
+def _disconnect_app(completed=None):
+    from fastapi import BackgroundTasks, Depends, FastAPI
+    from fastapi.responses import StreamingResponse
+    from app.api.middleware.disconnect import DisconnectMiddleware
+    from app.api.v1.dependencies.common import get_db_session
+
+    app = FastAPI()
+
+    @app.get("/lenta")
+    async def slow(session=Depends(get_db_session)):
+        await asyncio.sleep(5)
+
+    @app.get("/stream")
+    async def stream(session=Depends(get_db_session)):
+        async def chunks():
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                yield f"chunk{i};".encode()
+        return StreamingResponse(chunks())
+
+    @app.get("/background")
+    async def background(tasks: BackgroundTasks, session=Depends(get_db_session)):
+        async def job():
+            await asyncio.sleep(0.05)
+            completed.append("job")
+        tasks.add_task(job)
+        return {"ok": True}
+
+    return DisconnectMiddleware(app)
+
+
+def _http_scope(path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+
+
+def test_client_disconnect_cancels_request_quietly():
+    sent = []
+
+    async def run():
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await asyncio.wait_for(_disconnect_app()(_http_scope("/lenta"), receive, send), timeout=2)
+        return asyncio.current_task().cancelling()
+
+    assert asyncio.run(run()) == 0  # no lanza CancelledError ni deja la tarea cancelándose
+    assert sent == []
+
+
+def _serve_until_complete(path: str, completed=None):
+    """Como uvicorn: tras enviar la respuesta completa, `receive` devuelve http.disconnect."""
+    from app.core.metrics import metrics
+
+    sent = []
+    cancelled_key = metrics._key("requests_cancelled_total", {"reason": "client_disconnect"})
+    before = metrics._counters[cancelled_key]
+
+    async def run():
+        request_sent = False
+        response_complete = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete.set()
+
+        await asyncio.wait_for(_disconnect_app(completed)(_http_scope(path), receive, send), timeout=2)
+
+    asyncio.run(run())
+    assert metrics._counters[cancelled_key] == before
+    return sent
+
+
+def test_streaming_response_is_not_cancelled_after_completion():
+    sent = _serve_until_complete("/stream")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    assert body == b"chunk0;chunk1;chunk2;"
+
+
+def test_background_task_is_not_cancelled_after_response():
+    completed = []
+    sent = _serve_until_complete("/background", completed)
+    assert sent[0]["status"] == 200
+    assert completed == ["job"]
+
+
+def test_cancellation_without_disconnect_propagates():
+    async def run():
+        async def receive():
+            await asyncio.sleep(10)
+
+        async def send(message):
+            pass
+
+        task = asyncio.create_task(_disconnect_app()(_http_scope("/lenta"), receive, send))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+
+def test_uvicorn_loggers_go_through_the_queue():
+    import logging
+    from app.core.logging_config import UVICORN_LOGGERS, ContextQueueHandler
+
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        assert uvicorn_logger.handlers == []
+        assert uvicorn_logger.propagate
+    assert any(isinstance(h, ContextQueueHandler) for h in logging.getLogger().handlers)
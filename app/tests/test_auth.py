@@ -0,0 +1,93 @@
+# app/tests/test_auth.py
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import AuthenticationError
+from app.core.security import hash_password
+from app.schemas.auth_schema import AuthenticatedUser, UserCredentials
+from app.use_cases import auth_service
+from app.use_cases.auth_service import AuthService
+
+
+class FakeCredentialsRepository:
+    def __init__(self, users):
+        self.users = users
+
+    async def get_credentials(self, username):
+        return self.users.get(username)
+
+
+@pytest.fixture
+def verified(monkeypatch):
+    """Registra cada verificación bcrypt y en qué hilo se ejecuta."""
+    calls = []
+
+    async def fake_run_in_threadpool(func, *args):
+        calls.append(args[1])
+        return func(*args)
+
+    monkeypatch.setattr(auth_service, "run_in_threadpool", fake_run_in_threadpool)
+    return calls
+
+
+def _service():
+    alice = UserCredentials(
+        id=1, username="alice", email="alice@example.com", is_active=True,
+        hashed_password=hash_password("secreto"), token_version=0,
+    )
+    return AuthService(FakeCredentialsRepository({"alice": alice}))
+
+
+def test_authenticate_verifies_password_in_threadpool(verified):
+    token = asyncio.run(_service().authenticate("alice", "secreto"))
+    assert token.access_token
+    assert len(verified) == 1
+
+
+def test_unknown_username_still_verifies_against_dummy_hash(verified):
+    service = _service()
+    with pytest.raises(AuthenticationError) as unknown:
+        asyncio.run(service.authenticate("nadie", "secreto"))
+    with pytest.raises(AuthenticationError) as wrong:
+        asyncio.run(service.authenticate("alice", "incorrecta"))
+    assert str(unknown.value) == str(wrong.value)
+    assert len(verified) == 2  # bcrypt se ejecuta exista o no el usuario
+
+
+# ==========================================================
+# 🔹 Solo el dueño modifica o borra su cuenta
+# ==========================================================
+@pytest.fixture
+def client_as_user_1():
+    from app.api.v1.dependencies.common import get_current_user
+    from app.main import create_app
+
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        id=1, username="alice", email="alice@example.com", is_active=True
+    )
+    return TestClient(app)
+
+
+def test_update_other_user_is_forbidden(client_as_user_1):
+    response = client_as_user_1.put("/users/2", json={"username": "robado"})
+    assert response.status_code == 403
+
+
+def test_delete_other_user_is_forbidden(client_as_user_1):
+    assert client_as_user_1.delete("/users/2").status_code == 403
+
+
+def test_update_requires_authentication():
+    from app.main import create_app
+
+    response = TestClient(create_app()).put("/users/2", json={"username": "robado"})
+    assert response.status_code == 401
+
+
+def test_is_active_is_not_writable():
+    from app.schemas.user_schema import UserUpdate
+
+    assert "is_active" not in UserUpdate(is_active=False).model_dump(exclude_unset=True)
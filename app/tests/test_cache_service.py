@@ -0,0 +1,104 @@
+# app/tests/test_cache_service.py
+import json
+import time
+
+from app.infrastructure.services.cache_service import TTLCache, VerifiedTokenCache, handle_auth_invalidation, token_cache
+
+
+# ==========================================================
+# 🔹 TTLCache
+# ==========================================================
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=3, ttl_seconds=60)
+    for i in range(5):
+        cache.set(f"k{i}", i)
+    assert cache.keys() == ["k2", "k3", "k4"]
+
+
+def test_ttl_cache_get_refreshes_lru_order_but_contains_does_not():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert "a" in cache
+    assert cache.keys() == ["a", "b"]
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.keys() == ["a", "c"]
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("viejo", 1, expires_at=time.time() - 1)
+    assert cache.get("viejo") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_calls_on_evict():
+    evicted = []
+    cache = TTLCache(max_size=1, ttl_seconds=60, on_evict=lambda k, v: evicted.append(k))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.pop("b")
+    assert evicted == ["a", "b"]
+
+
+# ==========================================================
+# 🔹 VerifiedTokenCache
+# ==========================================================
+def _exp():
+    return time.time() + 600
+
+
+def test_token_cache_keeps_most_recent_tokens_and_prunes_user_index():
+    cache = VerifiedTokenCache(max_size=3, ttl_seconds=60)
+    for i in range(5):
+        cache.set(f"k{i}", 1, f"user{i}", _exp(), cache.generation(1))
+    assert cache._tokens.keys() == ["k2", "k3", "k4"]
+    assert cache._tokens_by_user == {1: {"k2", "k3", "k4"}}
+    assert cache.get("k0") is None
+    assert cache.get("k4") == "user4"
+
+
+def test_token_cache_revoke():
+    cache = VerifiedTokenCache(max_size=10, ttl_seconds=60)
+    cache.set("k", 1, "user", _exp(), cache.generation(1))
+    cache.revoke("k", _exp())
+    assert cache.is_revoked("k")
+    assert cache.get("k") is None
+    cache.set("k", 1, "user", _exp(), cache.generation(1))
+    assert cache.get("k") is None
+
+
+def test_token_cache_invalidate_user_discards_tokens_and_stale_reads():
+    cache = VerifiedTokenCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, "user", _exp(), cache.generation(1))
+    cache.set("b", 2, "other", _exp(), cache.generation(2))
+    generation = cache.generation(1)  # lectura de BD en curso...
+    cache.invalidate_user(1)
+    cache.set("c", 1, "user", _exp(), generation)  # ...que termina tras invalidar
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert cache.get("b") == "other"
+
+
+def test_token_cache_clear():
+    cache = VerifiedTokenCache(max_size=10, ttl_seconds=60)
+    generation = cache.generation(1)
+    cache.set("a", 1, "user", _exp(), generation)
+    cache.revoke("b", _exp())
+    cache.clear()
+    assert cache.get("a") is None
+    assert not cache.is_revoked("b")
+    cache.set("a", 1, "user", _exp(), generation)
+    assert cache.get("a") is None
+
+
+def test_handle_auth_invalidation_applies_broadcast_events():
+    expires_at = _exp()
+    token_cache.set("t1", 7, "user", expires_at, token_cache.generation(7))
+    token_cache.set("t2", 8, "user", expires_at, token_cache.generation(8))
+    handle_auth_invalidation(json.dumps({"type": "token", "token_hash": "t1", "expires_at": expires_at}))
+    handle_auth_invalidation(json.dumps({"type": "user", "user_id": 8}))
+    assert token_cache.is_revoked("t1")
+    assert token_cache.get("t2") is None
+    token_cache.clear()
@@ -0,0 +1,132 @@
+# app/tests/test_negotiation.py
+import gzip
+from typing import List
+
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.api.middleware import negotiation
+from app.api.middleware.negotiation import ContentNegotiationMiddleware, negotiate_encoding
+from app.api.responses import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, negotiate_media_type
+
+
+# ==========================================================
+# 🔹 Negociación de headers
+# ==========================================================
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_negotiate_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(negotiation, "brotli", None)
+    assert negotiate_encoding("br, gzip") == "gzip"
+    assert negotiate_encoding("br") is None
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("", JSON_MEDIA_TYPE),
+    ("*/*", JSON_MEDIA_TYPE),
+    ("application/json", JSON_MEDIA_TYPE),
+    ("application/msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/json, application/msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/json, application/msgpack;q=0.5", JSON_MEDIA_TYPE),
+    ("application/msgpack;q=0", JSON_MEDIA_TYPE),
+])
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+# ==========================================================
+# 🔹 Middleware
+# ==========================================================
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def _client(**options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items", response_model=List[Item])
+    async def items(n: int = 100):
+        return [Item(id=i, name=f"item {i}") for i in range(n)]
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a" * 2000, b"b" * 2000]), media_type="text/plain")
+
+    app.add_middleware(ContentNegotiationMiddleware, **options)
+    return TestClient(app)
+
+
+def _raw(client: TestClient, path: str, **headers):
+    # Sin descompresión automática del cliente para ver el cuerpo tal cual llega
+    with client.stream("GET", path, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_json_by_default_with_vary_accept():
+    response, body = _raw(_client(), "/items?n=3", **{"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == JSON_MEDIA_TYPE
+    assert "Accept" in response.headers["vary"]
+    assert body.startswith(b'[{"id":0')
+
+
+def test_msgpack_rendering():
+    response, body = _raw(_client(), "/items?n=3", Accept="application/msgpack", **{"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert int(response.headers["content-length"]) == len(body)
+    assert msgpack.unpackb(body) == [{"id": i, "name": f"item {i}"} for i in range(3)]
+
+
+def test_msgpack_then_gzip():
+    response, body = _raw(_client(minimum_size=10), "/items", Accept="application/msgpack", **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(body)
+    assert msgpack.unpackb(gzip.decompress(body))[99] == {"id": 99, "name": "item 99"}
+
+
+def test_bodies_below_minimum_size_are_not_compressed():
+    client = _client(minimum_size=10_000)
+    response, body = _raw(client, "/items?n=3", **{"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    response, body = _raw(client, "/items?n=1000", **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert gzip.decompress(body).startswith(b'[{"id":0')
+
+
+def test_streaming_responses_pass_through():
+    response, body = _raw(_client(minimum_size=10), "/stream", **{"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert body == b"a" * 2000 + b"b" * 2000
+
+
+@pytest.mark.parametrize("threadpool_min_bytes, expected_calls", [(10 ** 9, 0), (1, 2)])
+def test_threadpool_threshold(monkeypatch, threadpool_min_bytes, expected_calls):
+    calls = []
+
+    async def fake_run_in_threadpool(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(negotiation, "run_in_threadpool", fake_run_in_threadpool)
+    client = _client(minimum_size=10, threadpool_min_bytes=threadpool_min_bytes)
+    response, body = _raw(client, "/items", Accept="application/msgpack", **{"Accept-Encoding": "gzip"})
+    assert len(msgpack.unpackb(gzip.decompress(body))) == 100
+    assert len(calls) == expected_calls  # transcodificación + compresión
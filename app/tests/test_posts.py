@@ -0,0 +1,240 @@
+# app/tests/test_posts.py
+import asyncio
+
+import pytest
+
+from app.infrastructure.services import post_change_feed as feed_module
+from app.infrastructure.services.pg_listener import PgListener
+from app.infrastructure.services.post_change_feed import PostChangeFeed
+
+
+# ==========================================================
+# 🔹 PostChangeFeed: reanudación más allá de una página de post_events
+# ==========================================================
+@pytest.fixture
+def feed(monkeypatch):
+    monkeypatch.setattr(feed_module, "EVENTS_PAGE_SIZE", 10)
+    stored = [{"id": i, "op": "UPDATE", "post_id": i} for i in range(1, 26)]
+
+    async def events_after(event_id, limit=10):
+        return [e for e in stored if e["id"] > event_id][:limit]
+
+    feed = PostChangeFeed(PgListener("postgresql://unused"), queue_size=100, buffer_size=5, retention_hours=24)
+    monkeypatch.setattr(feed, "_events_after", events_after)
+    return feed
+
+
+def test_subscribe_replays_every_page_until_caught_up(feed):
+    async def run():
+        _, replay = await feed.subscribe(last_event_id=3)
+        return [event["id"] async for event in replay]
+
+    assert asyncio.run(run()) == list(range(4, 26))
+
+
+def test_catch_up_dispatches_every_page(feed):
+    async def run():
+        subscriber, _ = await feed.subscribe()
+        feed.last_id = 0
+        await feed._catch_up()
+        return [subscriber.queue.get_nowait()["id"] for _ in range(subscriber.queue.qsize())]
+
+    assert asyncio.run(run()) == list(range(1, 26))
+    assert feed.last_id == 25
+
+
+def test_notify_during_catch_up_is_dispatched_once_and_in_order(feed, monkeypatch):
+    import json
+
+    paged = feed._events_after
+
+    async def events_after(event_id, limit=10):
+        page = await paged(event_id, limit)
+        if event_id == 0:
+            # Llega en vivo un evento que la paginación aún no ha alcanzado
+            feed._on_notify(json.dumps({"id": 20, "op": "UPDATE", "post_id": 20}))
+        return page
+
+    monkeypatch.setattr(feed, "_events_after", events_after)
+
+    async def run():
+        subscriber, _ = await feed.subscribe()
+        feed.last_id = 0
+        await feed._catch_up()
+        feed._on_notify(json.dumps({"id": 25, "op": "UPDATE", "post_id": 25}))  # repetido en vivo
+        return [subscriber.queue.get_nowait()["id"] for _ in range(subscriber.queue.qsize())]
+
+    assert asyncio.run(run()) == list(range(1, 26))
+    assert [event["id"] for event in feed.buffer] == list(range(21, 26))
+
+
+# ==========================================================
+# 🔹 Contenido comprimido (content / content_gz)
+# ==========================================================
+def test_encode_decode_round_trip_around_threshold():
+    from app.infrastructure.db.post_content import decode_content, encode_content, settings
+
+    threshold = settings.POST_CONTENT_COMPRESSION_THRESHOLD
+    for size in (0, threshold - 1, threshold, threshold + 1, threshold * 10):
+        text = ("ñ" + "a" * size)[:size] if size else ""
+        content, content_gz = encode_content(text)
+        if len(text.encode("utf-8")) <= threshold:
+            assert (content, content_gz) == (text, None)
+        else:
+            assert content is None and content_gz is not None
+        assert decode_content(content, content_gz) == text
+
+
+def test_encode_threshold_counts_utf8_bytes():
+    from app.infrastructure.db.post_content import encode_content, settings
+
+    text = "ñ" * (settings.POST_CONTENT_COMPRESSION_THRESHOLD // 2 + 1)  # 2 bytes por carácter
+    assert encode_content(text)[0] is None
+
+
+def test_iter_decompressed_spans_several_chunks():
+    import gzip
+    import random
+    from app.infrastructure.db.post_content import CHUNK_SIZE, iter_decompressed
+
+    rng = random.Random(0)
+    raw = bytes(rng.getrandbits(8) for _ in range(3 * CHUNK_SIZE + 123))  # poco comprimible
+    content_gz = gzip.compress(raw)
+    assert len(content_gz) > 2 * CHUNK_SIZE
+    chunks = list(iter_decompressed(content_gz))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == raw
+
+
+@pytest.fixture
+def content_client():
+    import gzip
+    from fastapi.testclient import TestClient
+    from app.api.v1.dependencies.common import get_post_service
+    from app.main import create_app
+
+    stored = {1: ("corto", None), 2: (None, gzip.compress(b"largo " * 20000, mtime=0))}
+
+    class FakePostService:
+        async def get_post_content(self, post_id):
+            return stored.get(post_id)
+
+    app = create_app()
+    app.dependency_overrides[get_post_service] = FakePostService
+    return TestClient(app), stored
+
+
+def _get_raw(client, path, **headers):
+    with client.stream("GET", path, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_content_route_plain_text(content_client):
+    client, _ = content_client
+    response, body = _get_raw(client, "/posts/1/content", **{"Accept-Encoding": "identity"})
+    assert response.headers["content-type"].startswith("text/plain")
+    assert body == b"corto"
+    assert client.get("/posts/3/content").status_code == 404
+
+
+def test_content_route_sends_stored_gzip_as_is(content_client):
+    client, stored = content_client
+    response, body = _get_raw(client, "/posts/2/content", **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert body == stored[2][1]
+
+
+def test_content_route_streams_decompressed_without_gzip(content_client):
+    client, _ = content_client
+    response, body = _get_raw(client, "/posts/2/content", **{"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert "content-length" not in response.headers  # streaming
+    assert body == b"largo " * 20000
+
+
+# ==========================================================
+# 🔹 Posts recientes: RecentPostsSnapshot.refresh y GET /posts/recent
+# ==========================================================
+@pytest.fixture
+def recent_snapshot(monkeypatch):
+    from datetime import datetime, timezone
+    from app.infrastructure.db.repositories.post_repository_impl import PostRepositoryImpl
+    from app.infrastructure.services.recent_posts_snapshot import recent_posts_snapshot
+    from app.schemas.post_schema import PostListResponse
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    posts = [
+        PostListResponse(id=i, title=f"Post {i}", created_at=now, updated_at=now)
+        for i in (2, 1)
+    ]
+    requested = []
+
+    async def list_recent(self, limit):
+        requested.append(limit)
+        return posts
+
+    # La sesión se crea sin conectar: list_recent no llega a usarla
+    monkeypatch.setattr(PostRepositoryImpl, "list_recent", list_recent)
+    monkeypatch.setattr(recent_posts_snapshot, "current", None)
+    return recent_posts_snapshot, requested
+
+
+@pytest.fixture
+def recent_client(recent_snapshot):
+    from fastapi.testclient import TestClient
+    from app.main import create_app
+
+    return TestClient(create_app())
+
+
+def test_snapshot_refresh_builds_body_gzip_and_etag(recent_snapshot):
+    import gzip
+    import json
+
+    snapshot, requested = recent_snapshot
+    asyncio.run(snapshot.refresh())
+    current = snapshot.current
+
+    assert requested == [snapshot.size]
+    assert current.count == 2
+    assert [post["id"] for post in json.loads(current.body)] == [2, 1]
+    assert gzip.decompress(current.body_gz) == current.body
+    etag = current.etag
+
+    # Mismo contenido -> mismo ETag (gzip sin mtime: bytes reproducibles)
+    asyncio.run(snapshot.refresh())
+    assert snapshot.current.etag == etag
+    assert snapshot.current.body_gz == current.body_gz
+
+
+def test_recent_posts_unavailable_before_first_build(recent_client):
+    response = recent_client.get("/posts/recent")
+    assert response.status_code == 503
+
+
+def test_recent_posts_not_modified_with_matching_etag(recent_snapshot, recent_client):
+    snapshot, _ = recent_snapshot
+    asyncio.run(snapshot.refresh())
+
+    response = recent_client.get("/posts/recent", headers={"If-None-Match": snapshot.current.etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == snapshot.current.etag
+
+    response = recent_client.get("/posts/recent", headers={"If-None-Match": '"otro"'})
+    assert response.status_code == 200
+
+
+def test_recent_posts_gzip_and_plain_bodies(recent_snapshot, recent_client):
+    snapshot, _ = recent_snapshot
+    asyncio.run(snapshot.refresh())
+
+    response, body = _get_raw(recent_client, "/posts/recent", **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert body == snapshot.current.body_gz
+
+    response, body = _get_raw(recent_client, "/posts/recent", **{"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"] == "application/json"
+    assert body == snapshot.current.body
@@ -0,0 +1,178 @@
+# app/tests/test_query_plans.py
+"""
+Regresión de planes de consulta.
+
+Siembra un dataset representativo, ejecuta cada método de PostRepositoryImpl y
+UserRepositoryImpl capturando las sentencias que emiten, y compara el resultado de
+`EXPLAIN (FORMAT JSON)` de cada una con `snapshots/query_plans.json`:
+- un índice usado en el snapshot deja de usarse -> falla
+- una tabla que se leía por índice pasa a Seq Scan -> falla
+- el coste estimado total crece más de COST_TOLERANCE -> falla
+
+Requiere TEST_DATABASE_URL (se recrean las tablas). Para regenerar el snapshot:
+    UPDATE_PLAN_SNAPSHOTS=1 TEST_DATABASE_URL=... pytest app/tests/test_query_plans.py
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL no configurada")
+
+SNAPSHOT_PATH = Path(__file__).parent / "snapshots" / "query_plans.json"
+UPDATE_SNAPSHOTS = os.getenv("UPDATE_PLAN_SNAPSHOTS") == "1"
+COST_TOLERANCE = 0.20
+
+NUM_USERS = 5_000
+NUM_POSTS = 50_000
+
+SEED_SQL = [
+    f"""
+    INSERT INTO users (email, username, hashed_password, is_active, created_at, updated_at)
+    SELECT 'user' || g || '@example.com', 'user' || g, 'x', true,
+           now() - g * interval '1 minute', now() - g * interval '1 minute'
+    FROM generate_series(1, {NUM_USERS}) AS g
+    """,
+    f"""
+    INSERT INTO posts (title, content, user_id, created_at, updated_at)
+    SELECT 'Post ' || g, repeat('lorem ipsum ', 50), 1 + (g % {NUM_USERS}),
+           now() - g * interval '1 second', now() - g * interval '1 second'
+    FROM generate_series(1, {NUM_POSTS}) AS g
+    """,
+    "ANALYZE users",
+    "ANALYZE posts",
+]
+
+
+def _cases():
+    """(nombre, fábrica(session) -> corrutina). Lecturas primero; mutaciones al final."""
+    from app.infrastructure.db.repositories.post_repository_impl import PostRepositoryImpl
+    from app.infrastructure.db.repositories.user_repository_impl import UserRepositoryImpl
+    from app.schemas.post_schema import PostCreate, PostUpdate
+    from app.schemas.user_schema import UserCreate, UserUpdate
+
+    return [
+        ("posts.get_by_id", lambda s: PostRepositoryImpl(s).get_by_id(42)),
+        ("posts.get_by_id.core", lambda s: PostRepositoryImpl(s, core_reads=True).get_by_id(42)),
+        ("posts.get_content", lambda s: PostRepositoryImpl(s).get_content(42)),
+        ("posts.list_recent", lambda s: PostRepositoryImpl(s).list_recent(50)),
+        ("posts.list_posts", lambda s: PostRepositoryImpl(s).list_posts()),
+        ("posts.list_posts.core", lambda s: PostRepositoryImpl(s, core_reads=True).list_posts()),
+        ("users.get_by_id", lambda s: UserRepositoryImpl(s).get_by_id(42)),
+        ("users.get_by_id.core", lambda s: UserRepositoryImpl(s, core_reads=True).get_by_id(42)),
+        ("users.get_by_username", lambda s: UserRepositoryImpl(s).get_by_username("user42")),
+        ("users.get_by_username.core", lambda s: UserRepositoryImpl(s, core_reads=True).get_by_username("user42")),
+        ("users.get_credentials", lambda s: UserRepositoryImpl(s).get_credentials("user42")),
+        ("users.get_auth_state", lambda s: UserRepositoryImpl(s).get_auth_state(42, "0" * 64)),
+        ("users.username_exists", lambda s: UserRepositoryImpl(s).username_exists("user42")),
+        ("users.email_exists", lambda s: UserRepositoryImpl(s).email_exists("user42@example.com")),
+        ("users.list_all", lambda s: UserRepositoryImpl(s).list_all()),
+        ("users.list_all.core", lambda s: UserRepositoryImpl(s, core_reads=True).list_all()),
+        ("posts.create", lambda s: PostRepositoryImpl(s).create(
+            PostCreate(title="Nuevo", content="contenido", user_id=42))),
+        ("posts.update", lambda s: PostRepositoryImpl(s).update(42, PostUpdate(title="Editado"))),
+        ("posts.delete", lambda s: PostRepositoryImpl(s).delete(43)),
+        ("users.create", lambda s: UserRepositoryImpl(s).create(
+            UserCreate(email="nuevo@example.com", username="nuevo", password="secreto"))),
+        ("users.update", lambda s: UserRepositoryImpl(s).update(42, UserUpdate(username="editado"))),
+        ("users.delete", lambda s: UserRepositoryImpl(s).delete(44)),
+        ("users.revoke_token", lambda s: UserRepositoryImpl(s).revoke_token("0" * 64, 42, 4102444800.0)),
+    ]
+
+
+CASE_NAMES = [name for name, _ in _cases()] if TEST_DATABASE_URL else []
+
+
+def summarize_plan(plan: dict) -> dict:
+    """Reduce un plan JSON a lo que se compara: coste total, índices usados y seq scans."""
+    indexes, seq_scans = set(), set()
+    stack = [plan["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+        stack.extend(node.get("Plans", []))
+    return {
+        "total_cost": plan["Plan"]["Total Cost"],
+        "indexes": sorted(indexes),
+        "seq_scans": sorted(seq_scans),
+    }
+
+
+async def _collect_plans() -> dict:
+    from sqlalchemy import event, pool, text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.infrastructure.db.db_session import Base
+    import app.infrastructure.db.models  # noqa: F401  (registra los modelos en Base)
+
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=pool.NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for sql in SEED_SQL:
+            await conn.execute(text(sql))
+
+    captured = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    plans = {}
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    for name, factory in _cases():
+        captured.clear()
+        async with session_factory() as session:
+            await factory(session)
+        statements = list(captured)
+        async with engine.connect() as conn:
+            for i, (statement, parameters) in enumerate(statements):
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar_one()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                plans[f"{name}#{i}"] = summarize_plan(plan[0])
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+    return plans
+
+
+@pytest.fixture(scope="module")
+def plans() -> dict:
+    collected = asyncio.run(_collect_plans())
+    if UPDATE_SNAPSHOTS:
+        SNAPSHOT_PATH.write_text(json.dumps(collected, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return collected
+
+
+@pytest.fixture(scope="module")
+def snapshot() -> dict:
+    return json.loads(SNAPSHOT_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("case", CASE_NAMES)
+def test_query_plan_does_not_regress(case, plans, snapshot):
+    current = {key: plan for key, plan in plans.items() if key.split("#")[0] == case}
+    expected = {key: plan for key, plan in snapshot.items() if key.split("#")[0] == case}
+    if not expected:
+        pytest.skip(f"Sin snapshot para {case}: ejecutar con UPDATE_PLAN_SNAPSHOTS=1")
+
+    assert sorted(current) == sorted(expected), f"{case}: cambió el número de sentencias emitidas"
+    for key, plan in current.items():
+        old = expected[key]
+        lost = set(old["indexes"]) - set(plan["indexes"])
+        assert not lost, f"{key}: ya no usa {sorted(lost)} (plan actual: {plan})"
+        new_seq = set(plan["seq_scans"]) - set(old["seq_scans"])
+        assert not new_seq, f"{key}: nuevo Seq Scan sobre {sorted(new_seq)} (plan actual: {plan})"
+        limit = old["total_cost"] * (1 + COST_TOLERANCE)
+        assert plan["total_cost"] <= limit, (
+            f"{key}: coste estimado {plan['total_cost']} > {old['total_cost']} (+{COST_TOLERANCE:.0%})"
+        )
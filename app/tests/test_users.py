@@ -0,0 +1,137 @@
+# app/tests/test_users.py
+import asyncio
+import json
+
+import pytest
+
+from app.infrastructure.services.availability_index import AvailabilityIndex
+from app.infrastructure.services.bloom_filter import BloomFilter
+from app.infrastructure.services.pg_listener import PgListener
+from app.use_cases import user_service
+from app.use_cases.user_service import UserService
+
+
+# ==========================================================
+# 🔹 BloomFilter
+# ==========================================================
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    values = [f"user{i}" for i in range(1000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+    assert bloom.count == 1000
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}")
+    false_positives = sum(f"otro{i}" in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.03
+
+
+# ==========================================================
+# 🔹 check_availability
+# ==========================================================
+class FakeUserRepository:
+    def __init__(self, usernames=(), emails=()):
+        self.usernames = set(usernames)
+        self.emails = set(emails)
+        self.queries = 0
+
+    async def username_exists(self, username: str) -> bool:
+        self.queries += 1
+        return username in self.usernames
+
+    async def email_exists(self, email: str) -> bool:
+        self.queries += 1
+        return email in self.emails
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = AvailabilityIndex(PgListener("postgresql://unused"), capacity=100, error_rate=0.01, refresh_seconds=300)
+    index.usernames = BloomFilter(100)
+    index.emails = BloomFilter(100)
+    index.listener.connected.set()
+    monkeypatch.setattr(user_service, "availability_index", index)
+    return index
+
+
+def test_check_availability_answers_filter_negatives_without_db(index):
+    repo = FakeUserRepository()
+    result = asyncio.run(UserService(repo).check_availability(username="libre", email="libre@example.com"))
+    assert result.username_available and result.email_available
+    assert repo.queries == 0
+
+
+def test_check_availability_confirms_filter_hits_with_db(index):
+    index.add("ana", "ana@example.com")
+    repo = FakeUserRepository(usernames={"ana"})
+    result = asyncio.run(UserService(repo).check_availability(username="ana", email="ana@example.com"))
+    assert result.username_available is False
+    assert result.email_available is True  # falso positivo del filtro resuelto por la BD
+    assert repo.queries == 2
+
+
+def test_check_availability_sees_users_created_on_other_workers(index):
+    index._on_notify(json.dumps({"username": "remoto", "email": "remoto@example.com"}))
+    repo = FakeUserRepository(usernames={"remoto"})
+    result = asyncio.run(UserService(repo).check_availability(username="remoto"))
+    assert result.username_available is False
+
+
+def test_check_availability_goes_to_db_while_listener_is_disconnected(index):
+    index.listener.connected.clear()
+    repo = FakeUserRepository(usernames={"nuevo"})
+    result = asyncio.run(UserService(repo).check_availability(username="nuevo"))
+    assert result.username_available is False
+    assert repo.queries == 1
+
+
+# ==========================================================
+# 🔹 Actualización de usuarios
+# ==========================================================
+@pytest.mark.parametrize("field", ["email", "username", "password"])
+def test_user_update_rejects_explicit_null(field):
+    from pydantic import ValidationError
+    from app.schemas.user_schema import UserUpdate
+
+    with pytest.raises(ValidationError):
+        UserUpdate(**{field: None})
+    assert UserUpdate().model_dump(exclude_unset=True) == {}
+
+
+class _DbError(Exception):
+    def __init__(self, sqlstate):
+        self.sqlstate = sqlstate
+
+
+class FailingSession:
+    def __init__(self, sqlstate):
+        self.sqlstate = sqlstate
+        self.rolled_back = False
+
+    async def execute(self, stmt):
+        from sqlalchemy.exc import IntegrityError
+        raise IntegrityError("UPDATE users ...", {}, _DbError(self.sqlstate))
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_commit_unique_translates_only_unique_violations():
+    from sqlalchemy.exc import IntegrityError
+    from app.core.exceptions import DuplicateUserError
+    from app.infrastructure.db.repositories.user_repository_impl import UserRepositoryImpl
+
+    session = FailingSession("23505")
+    with pytest.raises(DuplicateUserError):
+        asyncio.run(UserRepositoryImpl(session)._commit_unique("stmt"))
+    assert session.rolled_back
+
+    session = FailingSession("23502")  # not_null_violation
+    with pytest.raises(IntegrityError):
+        asyncio.run(UserRepositoryImpl(session)._commit_unique("stmt"))
+    assert session.rolled_back
@@ -0,0 +1,82 @@
+# app/use_cases/auth_service.py
+import logging
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.exceptions import AuthenticationError
+from app.core.security import (
+    create_access_token, decode_access_token, dummy_password_hash, token_hash, verify_password,
+)
+from app.infrastructure.services.cache_service import token_cache
+from app.infrastructure.services.pg_listener import pg_listener
+from app.interfaces.repositories.user_repository import IUserRepository
+from app.schemas.auth_schema import AuthenticatedUser, Token
+
+logger = logging.getLogger(__name__)
+
+
+class AuthService:
+    """Login, emisión y verificación de tokens JWT, con caché de tokens ya verificados."""
+
+    def __init__(self, repository: IUserRepository):
+        self.repository = repository
+        self.settings = get_settings()
+
+    # ==========================================================
+    # 🔹 Login
+    # ==========================================================
+    async def authenticate(self, username: str, password: str) -> Token:
+        user = await self.repository.get_credentials(username)
+        # bcrypt fuera del event loop; con usuario inexistente se verifica contra un hash
+        # de referencia para que el tiempo de respuesta no revele qué usernames existen
+        password_ok = await run_in_threadpool(_verify_password, password, user.hashed_password if user else None)
+        if not user or not password_ok:
+            raise AuthenticationError("Usuario o contraseña incorrectos")
+        if not user.is_active:
+            raise AuthenticationError("Usuario inactivo")
+        return Token(
+            access_token=create_access_token(user.id, user.token_version),
+            expires_in=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    # ==========================================================
+    # 🔹 Resolver token -> usuario activo
+    # ==========================================================
+    async def resolve_token(self, token: str) -> AuthenticatedUser:
+        key = token_hash(token)
+        if token_cache.is_revoked(key):
+            raise AuthenticationError("Token revocado")
+        # Sin conexión LISTEN no llegan las invalidaciones de otros workers: se verifica en la BD
+        use_cache = pg_listener.connected.is_set()
+        cached = token_cache.get(key) if use_cache else None
+        if cached is not None:
+            return cached
+
+        payload = decode_access_token(token)
+        user_id = int(payload["sub"])
+        generation = token_cache.generation(user_id)
+        state = await self.repository.get_auth_state(user_id, key)
+        if not state or not state.is_active:
+            raise AuthenticationError("Usuario inexistente o inactivo")
+        if state.revoked:
+            raise AuthenticationError("Token revocado")
+        if payload.get("ver", 0) != state.token_version:
+            raise AuthenticationError("Token invalidado")
+        user = AuthenticatedUser.model_validate(state.model_dump(include=set(AuthenticatedUser.model_fields)))
+        if use_cache:
+            token_cache.set(key, user_id, user, payload["exp"], generation)
+        return user
+
+    # ==========================================================
+    # 🔹 Logout (revoca el token actual)
+    # ==========================================================
+    async def logout(self, token: str) -> None:
+        payload = decode_access_token(token)
+        await self.repository.revoke_token(token_hash(token), int(payload["sub"]), payload["exp"])
+        logger.info(f"Token revocado para el usuario {payload['sub']}")
+
+
+def _verify_password(password: str, hashed_password: Optional[str]) -> bool:
+    return verify_password(password, hashed_password or dummy_password_hash())
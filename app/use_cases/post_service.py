@@ -1,8 +1,8 @@
 # app/services/post_service.py
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.interfaces.repositories.post_repository import IPostRepository
 from app.schemas.post_schema import (
-    PostCreate, PostUpdate, PostResponse
+    PostCreate, PostUpdate, PostResponse, PostListResponse
 )
 
 class PostService:
@@ -19,7 +19,10 @@ class PostService:
     async def get_post(self, post_id: int) -> Optional[PostResponse]:
         return await self.repository.get_by_id(post_id)
 
-    async def list_posts(self) -> List[PostResponse]:
+    async def get_post_content(self, post_id: int) -> Optional[Tuple[Optional[str], Optional[bytes]]]:
+        return await self.repository.get_content(post_id)
+
+    async def list_posts(self) -> List[PostListResponse]:
         return await self.repository.list_posts()
 
     async def update_post(self, post_id: int, post_data: PostUpdate) -> Optional[PostResponse]:
@@ -4,9 +4,11 @@ from uuid import UUID
 import logging
 
 from app.domain.models.user import User as DomainUser
-from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
+from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse, AvailabilityResponse
 from app.interfaces.repositories.user_repository import IUserRepository
 from app.core.security import hash_password, verify_password
+from app.core.metrics import metrics
+from app.infrastructure.services.availability_index import availability_index
 
 logger = logging.getLogger(__name__)
 
@@ -58,3 +60,28 @@ class UserService:
     # ==========================================================
     async def delete_user(self, user_id: int) -> bool:
         return await self.repository.delete(user_id)
+
+    # ==========================================================
+    # 🔹 Disponibilidad de username / email
+    # ==========================================================
+    async def check_availability(
+        self, username: Optional[str] = None, email: Optional[str] = None
+    ) -> AvailabilityResponse:
+        # El filtro descarta sin BD los valores que seguro no existen; solo los
+        # posibles aciertos se confirman con la consulta
+        response = AvailabilityResponse()
+        if username is not None:
+            if availability_index.might_contain_username(username):
+                response.username_available = not await self.repository.username_exists(username)
+                metrics.inc("availability_checks_total", field="username", source="db")
+            else:
+                response.username_available = True
+                metrics.inc("availability_checks_total", field="username", source="filter")
+        if email is not None:
+            if availability_index.might_contain_email(email):
+                response.email_available = not await self.repository.email_exists(email)
+                metrics.inc("availability_checks_total", field="email", source="db")
+            else:
+                response.email_available = True
+                metrics.inc("availability_checks_total", field="email", source="filter")
+        return response
@@ -0,0 +1,74 @@
+# scripts/bench_encodings.py
+"""
+Mide bytes en el cable y coste de CPU por codificación para un listado típico de posts.
+
+Uso:
+    python scripts/bench_encodings.py [num_posts]
+"""
+import gzip
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+REPEAT = 20
+
+
+def build_payload(num_posts: int) -> list:
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": i,
+            "title": f"Post número {i}",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            "created_at": now,
+            "updated_at": now,
+            "author": {"id": i % 500, "username": f"user{i % 500}", "email": f"user{i % 500}@example.com"},
+        }
+        for i in range(num_posts)
+    ]
+
+
+def measure(fn, data):
+    start = time.process_time()
+    for _ in range(REPEAT):
+        out = fn(data)
+    return out, (time.process_time() - start) / REPEAT * 1000
+
+
+def main():
+    num_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    payload = build_payload(num_posts)
+
+    encoders = {"json": lambda p: json.dumps(p, ensure_ascii=False, separators=(",", ":")).encode("utf-8")}
+    if msgpack is not None:
+        encoders["msgpack"] = lambda p: msgpack.packb(p, use_bin_type=True)
+
+    compressors = {"identity": lambda b: b}
+    for level in (1, 6, 9):
+        compressors[f"gzip-{level}"] = lambda b, level=level: gzip.compress(b, compresslevel=level, mtime=0)
+    if brotli is not None:
+        for quality in (1, 4, 11):
+            compressors[f"br-{quality}"] = lambda b, quality=quality: brotli.compress(b, quality=quality)
+
+    print(f"{num_posts} posts, media de {REPEAT} repeticiones")
+    print(f"{'codificación':<24}{'bytes':>12}{'render ms':>12}{'compr. ms':>12}")
+    for enc_name, encode in encoders.items():
+        body, render_ms = measure(encode, payload)
+        for comp_name, compress in compressors.items():
+            wire, compress_ms = measure(compress, body)
+            print(f"{enc_name + '+' + comp_name:<24}{len(wire):>12}{render_ms:>12.2f}{compress_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
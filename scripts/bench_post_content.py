@@ -0,0 +1,54 @@
+# scripts/bench_post_content.py
+"""
+Mide el tamaño de la tabla posts (heap + TOAST + índices) y la latencia del listado.
+Ejecutar antes y después de `alembic upgrade` para comparar.
+Usa la BD de DATABASE_URL: ejecutar solo contra una base de pruebas.
+
+Uso:
+    python scripts/bench_post_content.py [repeticiones]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from app.infrastructure.db.db_session import AsyncSessionLocal, dispose_db
+from app.infrastructure.db.repositories.post_repository_impl import PostRepositoryImpl
+
+SIZE_SQL = """
+SELECT pg_size_pretty(pg_relation_size('posts')) AS heap,
+       pg_size_pretty(COALESCE(pg_total_relation_size(reltoastrelid), 0)) AS toast,
+       pg_size_pretty(pg_indexes_size('posts')) AS indexes,
+       pg_size_pretty(pg_total_relation_size('posts')) AS total
+FROM pg_class WHERE relname = 'posts'
+"""
+
+
+async def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    async with AsyncSessionLocal() as session:
+        sizes = (await session.execute(text(SIZE_SQL))).one()
+    print(f"posts: heap={sizes.heap} toast={sizes.toast} índices={sizes.indexes} total={sizes.total}")
+
+    for name, core_reads in (("orm", False), ("core", True)):
+        timings = []
+        for _ in range(repeat):
+            async with AsyncSessionLocal() as session:
+                start = time.perf_counter()
+                posts = await PostRepositoryImpl(session, core_reads=core_reads).list_posts()
+                timings.append((time.perf_counter() - start) * 1000)
+        print(
+            f"listado {name}: {len(posts)} posts, "
+            f"p50={statistics.median(timings):.1f} ms, max={max(timings):.1f} ms"
+        )
+    await dispose_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+# scripts/bench_read_path.py
+"""
+Compara memoria pico y throughput del listado de posts por el ORM y por el camino Core.
+Usa la BD de DATABASE_URL: ejecutar solo contra una base de pruebas.
+
+Uso:
+    python scripts/bench_read_path.py [num_posts] [--seed]
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from app.infrastructure.db.db_session import AsyncSessionLocal, dispose_db
+from app.infrastructure.db.repositories.post_repository_impl import PostRepositoryImpl
+
+SEED_SQL = [
+    """
+    INSERT INTO users (email, username, hashed_password, is_active, created_at, updated_at)
+    SELECT 'bench' || g || '@example.com', 'bench' || g, 'x', true, now(), now()
+    FROM generate_series(1, 1000) AS g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO posts (title, content, user_id, created_at, updated_at)
+    SELECT 'Post ' || g, repeat('contenido ', 20),
+           (SELECT id FROM users ORDER BY id LIMIT 1 OFFSET (g % 1000)), now(), now()
+    FROM generate_series(1, :num_posts) AS g
+    """,
+]
+
+
+async def seed(num_posts: int) -> None:
+    async with AsyncSessionLocal() as session:
+        for sql in SEED_SQL:
+            await session.execute(text(sql), {"num_posts": num_posts})
+        await session.commit()
+
+
+async def measure(core_reads: bool) -> tuple:
+    # Tiempo y memoria en pasadas separadas: tracemalloc ralentiza varias veces la lectura
+    async with AsyncSessionLocal() as session:
+        repo = PostRepositoryImpl(session, core_reads=core_reads)
+        start = time.perf_counter()
+        posts = await repo.list_posts()
+        elapsed = time.perf_counter() - start
+    del posts
+
+    async with AsyncSessionLocal() as session:
+        repo = PostRepositoryImpl(session, core_reads=core_reads)
+        tracemalloc.start()
+        posts = await repo.list_posts()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(posts), elapsed, peak
+
+
+async def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    num_posts = int(args[0]) if args else 100_000
+    if "--seed" in sys.argv:
+        await seed(num_posts)
+
+    print(f"{'camino':<8}{'filas':>10}{'segundos':>12}{'filas/s':>12}{'pico MB':>10}")
+    for name, core_reads in (("orm", False), ("core", True)):
+        rows, elapsed, peak = await measure(core_reads)
+        print(f"{name:<8}{rows:>10}{elapsed:>12.3f}{rows / elapsed:>12.0f}{peak / 2**20:>10.1f}")
+    await dispose_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())